@@ -0,0 +1,395 @@
+# Offline benchmarks against mock_youtube_api. Usage: python benchmarks.py [name ...]
+import argparse
+import inspect
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+
+import youtube_bulk_edit as ybe
+from mock_youtube_api import FakeYouTube, make_video
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def bench_videos_list(video_count=20000, latency=0.05):
+    youtube = FakeYouTube(video_count, latency)
+    video_ids = list(youtube.store)
+
+    def sequential():
+        found = 0
+        for i in range(0, len(video_ids), ybe.VIDEOS_PER_REQUEST):
+            response = youtube.videos().list(part="snippet,status,recordingDetails", id=','.join(video_ids[i:i + ybe.VIDEOS_PER_REQUEST])).execute()
+            found += len(response['items'])
+        return found
+
+    def batched():
+        return sum(len(items) for items in ybe.iter_video_batches(youtube, video_ids))
+
+    print(f"videos.list over {video_count} videos, {latency * 1000:.0f} ms per round trip")
+    youtube.round_trips = 0
+    _, seq_time = timed("sequential videos.list", sequential)
+    seq_trips = youtube.round_trips
+    youtube.round_trips = 0
+    _, batch_time = timed("batched videos.list", batched)
+    print(f"round trips: {seq_trips} -> {youtube.round_trips}, speedup {seq_time / batch_time:.1f}x")
+
+
+def bench_fields(video_count=20000, latency=0.0):
+    youtube = FakeYouTube(video_count, latency)
+    video_ids = list(youtube.store)
+    print(f"videos.list over {video_count} videos, full parts vs the fields mask")
+    received = {}
+    for label, fields in (("full parts", None), ("fields mask", ybe.VIDEO_FIELDS)):
+        before = ybe.api_metrics.snapshot()
+        timed(label, lambda: sum(len(items) for items in ybe.iter_video_batches(youtube, video_ids, fields=fields)))
+        received[label] = ybe.metrics_delta(before, ybe.api_metrics.snapshot())['videos.list']['bytesReceived']
+    full, masked = received["full parts"], received["fields mask"]
+    print(f"bytes received: {full} -> {masked} ({1 - masked / full:.0%} less)")
+
+
+def fresh_channel(video_count, latency=0.05, error_rate=0.0, name='bench'):
+    # A mock channel plus a synced local database, set up without latency or errors
+    youtube = FakeYouTube(video_count, latency=0)
+    for path in (f"{name}.db", 'playlist_id_cache.json'):
+        if os.path.exists(path):
+            os.remove(path)
+    db = ybe.VideoDatabase(f"{name}.db")
+    store = ybe.VideoStore(ybe.get_all_videos(youtube, db), db=db)
+    youtube.latency = latency
+    youtube.error_rate = error_rate
+    youtube.round_trips = 0
+    return youtube, store
+
+
+def quota_used(func):
+    before = ybe.quota_ledger.units
+    result = func()
+    return result, ybe.quota_ledger.units - before
+
+
+def bench_sync(video_count=10000, latency=0.05, error_rate=0.0):
+    youtube = FakeYouTube(video_count, latency, error_rate)
+    print(f"get_all_videos over {video_count} videos, {latency * 1000:.0f} ms per round trip, {error_rate:.0%} injected errors")
+    for label, service_factory in (("sequential", None), ("pipelined", lambda: youtube)):
+        for path in ('sync.db', 'playlist_id_cache.json'):
+            if os.path.exists(path):
+                os.remove(path)
+        db = ybe.VideoDatabase('sync.db')
+        start = time.perf_counter()
+        first_rows = []
+
+        def on_videos(batch):
+            if not first_rows:
+                first_rows.append(time.perf_counter() - start)
+
+        youtube.round_trips = 0
+        (_, units), _ = timed(f"cold sync, {label}", lambda: quota_used(
+            lambda: ybe.get_all_videos(youtube, db, refresh=True, service_factory=service_factory, on_videos=on_videos)))
+        print(f"round trips: {youtube.round_trips}, quota: {units} units, first rows after {first_rows[0]:.3f}s")
+    for i in range(video_count, video_count + 20):
+        youtube.add_video(make_video(i))
+    youtube.round_trips = 0
+    (_, units), _ = timed("incremental sync, 20 new videos", lambda: quota_used(
+        lambda: ybe.get_all_videos(youtube, db, refresh=True, service_factory=lambda: youtube)))
+    print(f"round trips: {youtube.round_trips}, quota: {units} units")
+    db.close()
+
+
+UPDATE_SETTINGS = {'action': 'append', 'footer': 'New footer for the benchmark', 'title_action': 'none', 'tags_action': 'none'}
+
+
+def bench_update(video_count=500, latency=0.02, error_rate=0.02):
+    ybe.retry_policy.base_delay = 0.01  # Keep injected-error backoff from dominating the timing
+    print(f"bulk videos.update over {video_count} videos, {latency * 1000:.0f} ms per round trip, {error_rate:.0%} injected errors")
+    for workers in (1, ybe.MAX_WORKERS):
+        youtube, store = fresh_channel(video_count, latency, error_rate, name=f"update{workers}")
+        edit = ybe.CompiledEdit(UPDATE_SETTINGS)
+        engine = ybe.UpdateEngine(lambda: youtube, max_workers=workers, limiter=ybe.RateLimiter(0, 0))
+        jobs = edit.build_jobs(store)
+        run = lambda: engine.run(jobs, lambda yt, job: ybe.apply_video_update(yt, job[0], job[1], None, engine.limiter, store))
+        (results, units), elapsed = timed(f"{workers} worker(s)", lambda: quota_used(run))
+        failures = sum(1 for _, _, error in results if error)
+        print(f"  {len(jobs) / elapsed:.0f} updates/s, {failures} failed, {youtube.errors_injected} errors injected, {units} quota units")
+
+
+def bench_backup_restore(video_count=10000, latency=0.05, error_rate=0.0):
+    youtube, store = fresh_channel(video_count, latency, error_rate, name='backup')
+    print(f"backup/restore over {video_count} videos, {latency * 1000:.0f} ms per round trip")
+    video_ids = [v['id'] for v in store]
+    (path, count, new), _ = timed("first snapshot", lambda: ybe.backup_videos(youtube, store, 'backups'))
+    print(f"  {count} videos, {new} stored, {os.path.getsize(os.path.join('backups', 'objects.jsonl.gz')) / 1e6:.1f} MB pack")
+    changed = video_ids[::100]
+    for vid in changed:
+        youtube.store[vid]['snippet']['title'] += ' (edited)'
+        youtube.store[vid]['etag'] += '-edited'
+    youtube.round_trips = 0
+    (path, count, new), _ = timed(f"incremental snapshot, {len(changed)} changed", lambda: ybe.backup_videos(youtube, store, 'backups'))
+    print(f"  {new} stored, {youtube.round_trips} round trips, {os.path.getsize(path) / 1e3:.0f} KB manifest")
+    timed("read one video back from the pack", lambda: list(ybe.iter_backup(path, {video_ids[-1]})))
+    for vid in changed:
+        youtube.store[vid]['snippet']['title'] = youtube.store[vid]['snippet']['title'].replace(' (edited)', ' (broken)')
+        youtube.store[vid]['etag'] += '-broken'
+    engine = ybe.UpdateEngine(lambda: youtube, limiter=ybe.RateLimiter(0, 0))
+
+    def restore():
+        jobs, unchanged, missing = ybe.plan_restore(youtube, store, ybe.iter_backup(path))
+        return engine.run(jobs, lambda yt, job: ybe.apply_video_update(yt, job[0], job[1], None, engine.limiter, store))
+
+    (results, units), _ = timed("differential restore", lambda: quota_used(restore))
+    failures = sum(1 for _, _, error in results if error)
+    print(f"  {len(results) - failures} videos restored, {failures} failed, {units} quota units")
+
+
+SEARCH_QUERIES = ['video 123', 'subscribe', 'tag42', 'example com 99', 'no such words here']
+
+
+def bench_search(video_count=100000):
+    videos = synthetic_videos(video_count)
+
+    def linear(query):
+        # The original filter: the whole query as a substring of the lower-cased title or of the ID
+        query = query.lower()
+        return [v for v in videos if query in v['title'].lower() or query in v['id']]
+
+    print(f"search over {video_count} synthetic videos")
+    index, _ = timed("build SearchIndex", lambda: ybe.SearchIndex(videos))
+    for query in SEARCH_QUERIES:
+        matches, scan = timed(f"scan   '{query}'", lambda: linear(query))
+        result, indexed = timed(f"index  '{query}'", lambda: index.search(query))
+        # The index also searches descriptions and tags, so it can match more videos than the scan
+        print(f"  {len(matches)} scan matches, {len(result)} index matches, {scan / max(indexed, 1e-9):.1f}x faster")
+
+
+def synthetic_videos(count):
+    videos = []
+    for i in range(count):
+        v = make_video(i)
+        videos.append({
+            'id': v['id'],
+            'title': v['snippet']['title'],
+            'description': v['snippet']['description'] + f"\nFollow me at example.com/{i}\nOld footer line {i % 7}",
+            'tags': list(v['snippet']['tags']),
+            'categoryId': v['snippet']['categoryId'],
+            'defaultLanguage': '',
+            'status': dict(v['status']),
+            'recordingDate': '',
+        })
+    return videos
+
+
+DESCRIPTION_FOOTER = ''.join(f"\nMore from the channel: https://example.com/playlist/{n}" for n in range(20))
+
+
+def legacy_load_videos(db):
+    # VideoDatabase.load_videos before VideoRecord: a dict per video, description and status dict resident
+    tags = {}
+    for video_id, tag in db.conn.execute('SELECT video_id, tag FROM tags ORDER BY video_id, position'):
+        tags.setdefault(video_id, []).append(tag)
+    rows = db.conn.execute(
+        'SELECT id, title, description, category_id, default_language, published_at, status_json, recording_date, last_updated FROM videos'
+    ).fetchall()
+    return [{
+        'id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'tags': tags.get(row[0], []),
+        'categoryId': row[3],
+        'defaultLanguage': row[4] or '',
+        'publishedAt': row[5] or '',
+        'status': json.loads(row[6]) if row[6] else {},
+        'recordingDate': row[7] or '',
+        'lastUpdated': row[8],
+    } for row in rows]
+
+
+def traced_size(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(video_count=100000):
+    videos = synthetic_videos(video_count)
+    for v in videos:
+        v['description'] += DESCRIPTION_FOOTER
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ybe.VideoDatabase(os.path.join(tmp, 'memory.db'))
+        db.upsert_videos(videos)
+        del videos
+        print(f"in-memory video list for {video_count} videos loaded from the database")
+        dicts, dict_bytes = traced_size(lambda: legacy_load_videos(db))
+        del dicts
+        records, record_bytes = traced_size(db.load_videos)
+        print(f"{'dicts':<40} {dict_bytes / 1e6:8.1f} MB")
+        print(f"{'VideoRecord':<40} {record_bytes / 1e6:8.1f} MB ({dict_bytes / record_bytes:.1f}x smaller)")
+        timed("read every description on demand", lambda: sum(len(v['description']) for v in records))
+        db.close()
+
+
+TRANSFORM_SETTINGS = {
+    'action': 'find_replace',
+    'find': r'example\.com/(\d+)',
+    'replace': r'example.org/\1',
+    'use_regex': 1,
+    'title_action': 'append',
+    'title_text': '| Mayhem',
+    'tags_action': 'add',
+    'tags_text': 'mayhem, bulk edit, synthetic',
+}
+
+
+# compute_new_desc, compute_new_title and compute_new_tags as they were before CompiledEdit, as the baseline
+def legacy_compute_new_desc(desc, action, footer, find, replace, keyword, trim_m, use_regex):
+    new_desc = desc
+    changed = False
+    if action == "append":
+        new_desc = desc + "\n\n" + footer
+        changed = True
+    elif action == "prepend":
+        new_desc = footer + "\n\n" + desc
+        changed = True
+    elif action == "replace_all":
+        new_desc = footer
+        changed = True
+    elif action == "find_replace":
+        if find:
+            if use_regex:
+                new_desc = re.sub(find, replace, desc, flags=re.IGNORECASE)
+            else:
+                new_desc = desc.replace(find, replace)
+            changed = new_desc != desc
+    elif action == "trim":
+        if keyword and trim_m != "none":
+            if use_regex:
+                match = re.search(keyword, desc, flags=re.IGNORECASE)
+                if match:
+                    if trim_m == "before":
+                        new_desc = desc[match.start():]
+                    elif trim_m == "after":
+                        new_desc = desc[:match.end()]
+                    changed = True
+            else:
+                parts = desc.partition(keyword)
+                if parts[1]:
+                    if trim_m == "before":
+                        new_desc = parts[1] + parts[2]
+                    elif trim_m == "after":
+                        new_desc = parts[0] + parts[1]
+                    changed = True
+    elif action == "replace_after":
+        if keyword:
+            if use_regex:
+                match = re.search(keyword, desc, flags=re.IGNORECASE)
+                if match:
+                    new_desc = desc[:match.end()] + footer
+                    changed = True
+            else:
+                parts = desc.partition(keyword)
+                if parts[1]:
+                    new_desc = parts[0] + parts[1] + footer
+                    changed = True
+    if len(new_desc) > 5000:
+        new_desc = new_desc[:5000]  # Truncate to API limit
+        changed = True
+    return new_desc, changed
+
+
+def legacy_compute_new_title(title, title_action, title_text):
+    new_title = title
+    changed = False
+    if title_action == "append":
+        new_title = title + " " + title_text
+        changed = True
+    elif title_action == "prepend":
+        new_title = title_text + " " + title
+        changed = True
+    elif title_action == "replace":
+        new_title = title_text
+        changed = True
+    if len(new_title) > 100:
+        new_title = new_title[:100]
+        changed = True
+    return new_title, changed
+
+
+def legacy_compute_new_tags(tags, tags_action, tags_text):
+    new_tags = tags[:]
+    changed = False
+    if tags_action == "add":
+        new_tags.extend([t.strip() for t in tags_text.split(',') if t.strip()])
+        changed = True
+    elif tags_action == "replace":
+        new_tags = [t.strip() for t in tags_text.split(',') if t.strip()]
+        changed = True
+    elif tags_action == "remove":
+        remove_set = set([t.strip() for t in tags_text.split(',') if t.strip()])
+        new_tags = [t for t in new_tags if t not in remove_set]
+        changed = True
+    new_tags = ybe.optimize_tags(new_tags)
+    return new_tags, changed
+
+
+def bench_transforms(video_count=100000):
+    videos = synthetic_videos(video_count)
+    s = TRANSFORM_SETTINGS
+
+    def per_call():
+        # Re-interprets every parameter for every video, as the pre-compiled code did
+        for v in videos:
+            legacy_compute_new_title(v['title'], s['title_action'], s['title_text'])
+            legacy_compute_new_tags(v['tags'], s['tags_action'], s['tags_text'])
+            legacy_compute_new_desc(v['description'], s['action'], '', s['find'], s['replace'], '', 'none', s['use_regex'])
+
+    def compiled():
+        edit = ybe.CompiledEdit(s)
+        for v in videos:
+            edit.new_title(v['title'])
+            edit.new_tags(v['tags'])
+            edit.new_desc(v['description'])
+
+    print(f"title/tags/description transforms over {video_count} synthetic videos")
+    _, before = timed("per-call (pre-CompiledEdit code)", per_call)
+    _, after = timed("CompiledEdit", compiled)
+    print(f"per video: {before / video_count * 1e6:.1f} us -> {after / video_count * 1e6:.1f} us")
+
+
+BENCHMARKS = {
+    'videos_list': bench_videos_list,
+    'fields': bench_fields,
+    'sync': bench_sync,
+    'update': bench_update,
+    'backup_restore': bench_backup_restore,
+    'search': bench_search,
+    'transforms': bench_transforms,
+    'memory': bench_memory,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Offline YouTube Bulk Editor benchmarks")
+    parser.add_argument('names', nargs='*', help="Benchmarks to run: " + ', '.join(BENCHMARKS) + " (default: all)")
+    parser.add_argument('--videos', type=int, help="Synthetic channel size (each benchmark has its own default)")
+    parser.add_argument('--latency', type=float, help="Seconds per mock API round trip")
+    parser.add_argument('--error-rate', type=float, help="Fraction of requests answered with 429/503")
+    args = parser.parse_args()
+    options = {'video_count': args.videos, 'latency': args.latency, 'error_rate': args.error_rate}
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    os.chdir(tempfile.mkdtemp())  # Keep quota/cache files out of the working tree
+    for name in args.names or BENCHMARKS:
+        func = BENCHMARKS[name]
+        accepted = inspect.signature(func).parameters
+        func(**{key: value for key, value in options.items() if value is not None and key in accepted})
+        print()
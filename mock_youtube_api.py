@@ -0,0 +1,294 @@
+# In-process stand-in for the parts of the YouTube Data API v3 used by youtube_bulk_edit.py.
+# Mirrors the googleapiclient call shape: youtube.videos().list(...).execute()
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from googleapiclient.errors import HttpError
+
+COSTS = {
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1,
+    'videos.update': 50,
+    'thumbnails.set': 50,
+}
+ERROR_REASONS = {403: 'quotaExceeded', 404: 'videoNotFound', 429: 'rateLimitExceeded', 503: 'backendError'}
+READ_ONLY_FIELDS = {
+    'snippet': ('publishedAt', 'channelId', 'thumbnails', 'channelTitle', 'liveBroadcastContent', 'localized'),
+    'status': ('uploadStatus', 'madeForKids'),
+}
+FIRST_PUBLISHED = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def make_thumbnails(vid):
+    sizes = {'default': (120, 90), 'medium': (320, 180), 'high': (480, 360), 'standard': (640, 480), 'maxres': (1280, 720)}
+    return {name: {'url': f"https://i.ytimg.com/vi/{vid}/{name}.jpg", 'width': w, 'height': h} for name, (w, h) in sizes.items()}
+
+
+def make_video(i):
+    vid = f"vid{i:08d}"
+    title = f"Synthetic video {i}"
+    description = f"Description for video {i}\n\nSubscribe for more!"
+    return {
+        'kind': 'youtube#video',
+        'etag': f"etag-{vid}-0",
+        'id': vid,
+        'snippet': {
+            'publishedAt': (FIRST_PUBLISHED + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'channelId': 'UCsynthetic',
+            'title': title,
+            'description': description,
+            'thumbnails': make_thumbnails(vid),
+            'channelTitle': 'Synthetic Channel',
+            'tags': ['synthetic', f"tag{i % 100}"],
+            'categoryId': '22',
+            'liveBroadcastContent': 'none',
+            'localized': {'title': title, 'description': description},
+        },
+        'status': {
+            'uploadStatus': 'processed',
+            'privacyStatus': 'public',
+            'license': 'youtube',
+            'embeddable': True,
+            'publicStatsViewable': True,
+            'madeForKids': False,
+            'selfDeclaredMadeForKids': False,
+        },
+        'recordingDetails': {},
+    }
+
+
+def parse_fields(mask, i=0):
+    # A `fields` mask such as 'etag,items(id,snippet/title)' as a tree of {name: subtree or None for all}
+    tree = {}
+    while i < len(mask):
+        j = i
+        while j < len(mask) and mask[j] not in ',()':
+            j += 1
+        names = mask[i:j].strip().split('/')
+        sub = None
+        if j < len(mask) and mask[j] == '(':
+            sub, j = parse_fields(mask, j + 1)
+            j += 1
+        for name in reversed(names[1:]):
+            sub = {name: sub}
+        if names[0] in tree and (tree[names[0]] is None or sub is None):
+            tree[names[0]] = None
+        else:
+            tree[names[0]] = {**tree.get(names[0], {}), **sub} if sub is not None else None
+        if j < len(mask) and mask[j] == ')':
+            return tree, j
+        i = j + 1
+    return tree, i
+
+
+def project(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: project(value[name], sub) for name, sub in tree.items() if name in value}
+    return value
+
+
+class FakeResponse(dict):
+    # httplib2.Response look-alike: header dict plus a status
+    def __init__(self, status, headers=None):
+        super().__init__(headers or {})
+        self.status = status
+        self.reason = ''
+
+
+def make_error(status, retry_after=None):
+    headers = {'content-type': 'application/json'}
+    if retry_after is not None:
+        headers['retry-after'] = str(retry_after)
+    reason = ERROR_REASONS.get(status, 'unknown')
+    content = json.dumps({'error': {'code': status, 'message': reason, 'errors': [{'reason': reason}]}}).encode()
+    return HttpError(FakeResponse(status, headers), content)
+
+
+class FakeRequest:
+    def __init__(self, api, method, handler, kwargs):
+        self.api = api
+        self.method = method
+        self.handler = handler
+        self.kwargs = kwargs
+        self.headers = {}
+        self.body = json.dumps(kwargs['body']) if 'body' in kwargs else None
+        media = kwargs.get('media_body')
+        self.resumable = media if media is not None and media.resumable() else None
+        self.postproc = lambda resp, content: json.loads(content)
+
+    def respond(self):
+        # Runs the handler, applies any `fields` mask and decodes a JSON body the way the real client does
+        response = self.api.handle(self)
+        if self.kwargs.get('fields'):
+            response = project(response, parse_fields(self.kwargs['fields'])[0])
+        content = json.dumps(response).encode()
+        return self.postproc(FakeResponse(200), content)
+
+    def execute(self):
+        self.api.round_trip()
+        return self.respond()
+
+
+class FakeBatch:
+    def __init__(self, api, callback=None):
+        self.api = api
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback or self.callback))
+
+    def execute(self):
+        self.api.round_trip()
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request.respond(), None
+            except HttpError as e:
+                response, exception = None, e
+            callback(request_id, response, exception)
+
+
+class FakeResource:
+    def __init__(self, api, name, **handlers):
+        self.api = api
+        self.name = name
+        self.handlers = handlers
+
+    def __getattr__(self, name):
+        handler = self.handlers[name]
+        return lambda **kwargs: FakeRequest(self.api, f"{self.name}.{name}", handler, kwargs)
+
+
+class FakeYouTube:
+    # A synthetic channel of video_count videos. latency is slept once per round trip (a batch is one);
+    # error_rate injects 429/503 responses (with Retry-After) into individual requests, and quota_limit
+    # makes every request fail with quotaExceeded once the mock's own cost counter passes it.
+    def __init__(self, video_count=1000, latency=0.05, error_rate=0.0, error_statuses=(429, 503),
+                 retry_after=None, quota_limit=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.quota_limit = quota_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.calls = {}
+        self.quota_used = 0
+        self.errors_injected = 0
+        self.thumbnail_bytes = 0
+        self.versions = itertools.count(1)
+        self.store = {}
+        for i in range(video_count):
+            self.add_video(make_video(i))
+
+    def add_video(self, v):
+        with self.lock:
+            self.store[v['id']] = v
+            self.uploads = None  # Rebuilt on the next playlistItems.list
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def handle(self, request):
+        with self.lock:
+            self.calls[request.method] = self.calls.get(request.method, 0) + 1
+            if self.quota_limit is not None and self.quota_used >= self.quota_limit:
+                raise make_error(403)
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors_injected += 1
+                raise make_error(self.random.choice(self.error_statuses), self.retry_after)
+            self.quota_used += COSTS.get(request.method, 0)
+            return request.handler(request, **request.kwargs)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+    def channels(self):
+        return FakeResource(self, 'channels', list=self._channels_list)
+
+    def playlistItems(self):
+        return FakeResource(self, 'playlistItems', list=self._playlist_items_list)
+
+    def videos(self):
+        return FakeResource(self, 'videos', list=self._videos_list, update=self._videos_update)
+
+    def thumbnails(self):
+        return FakeResource(self, 'thumbnails', set=self._thumbnails_set)
+
+    def _channels_list(self, request, part, mine=True, **kwargs):
+        return {'kind': 'youtube#channelListResponse', 'items': [{
+            'id': 'UCsynthetic',
+            'snippet': {'title': 'Synthetic Channel'},
+            'contentDetails': {'relatedPlaylists': {'uploads': 'UUsynthetic'}},
+        }]}
+
+    def _playlist_items_list(self, request, part, playlistId, maxResults=5, pageToken=None, **kwargs):
+        if self.uploads is None:
+            self.uploads = sorted(self.store, key=lambda vid: self.store[vid]['snippet']['publishedAt'], reverse=True)
+        start = int(pageToken or 0)
+        items = []
+        for position, vid in enumerate(self.uploads[start:start + maxResults], start):
+            snippet = self.store[vid]['snippet']
+            items.append({'kind': 'youtube#playlistItem', 'etag': self.store[vid]['etag'], 'id': f"UU{vid}", 'snippet': {
+                'publishedAt': snippet['publishedAt'],
+                'channelId': 'UCsynthetic',
+                'title': snippet['title'],
+                'description': snippet['description'],
+                'thumbnails': snippet['thumbnails'],
+                'channelTitle': 'Synthetic Channel',
+                'videoOwnerChannelTitle': 'Synthetic Channel',
+                'videoOwnerChannelId': 'UCsynthetic',
+                'playlistId': playlistId,
+                'position': position,
+                'resourceId': {'kind': 'youtube#video', 'videoId': vid},
+            }})
+        response = {'kind': 'youtube#playlistItemListResponse', 'items': items,
+                    'pageInfo': {'totalResults': len(self.uploads), 'resultsPerPage': maxResults}}
+        if start + maxResults < len(self.uploads):
+            response['nextPageToken'] = str(start + maxResults)
+        return response
+
+    def _videos_list(self, request, part, id, **kwargs):
+        parts = part.split(',')
+        items = []
+        for vid in id.split(','):
+            if vid in self.store:
+                v = self.store[vid]
+                item = {'kind': v['kind'], 'etag': v['etag'], 'id': vid}
+                for name in parts:
+                    item[name] = v.get(name, {}) if name != 'statistics' else {'viewCount': str(int(vid[3:]) * 7 % 100000)}
+                items.append(item)
+        etag = 'list-' + str(hash((part, kwargs.get('fields'), tuple(item['etag'] for item in items))))
+        if request.headers.get('If-None-Match') == etag:
+            raise HttpError(FakeResponse(304), b'')
+        return {'kind': 'youtube#videoListResponse', 'etag': etag, 'items': items}
+
+    def _videos_update(self, request, part, body, **kwargs):
+        v = self.store.get(body['id'])
+        if v is None:
+            raise make_error(404)
+        for name in part.split(','):
+            # A part's writable properties are replaced whole, as the real endpoint does
+            kept = {key: v[name][key] for key in READ_ONLY_FIELDS.get(name, ()) if key in v.get(name, {})}
+            v[name] = {**body[name], **kept}
+        v['etag'] = f"etag-{v['id']}-u{next(self.versions)}"
+        return v
+
+    def _thumbnails_set(self, request, videoId, media_body, **kwargs):
+        if videoId not in self.store:
+            raise make_error(404)
+        self.thumbnail_bytes += media_body.size()
+        return {'kind': 'youtube#thumbnailSetResponse', 'items': [{'default': {'url': f"https://i.ytimg.com/vi/{videoId}/default.jpg"}}]}
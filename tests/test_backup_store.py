@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_bulk_edit as ybe
+from mock_youtube_api import FakeYouTube
+
+class BackupStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        patch = mock.patch.object(ybe, 'quota_ledger', ybe.QuotaLedger())
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.youtube = FakeYouTube(500, latency=0)
+        self.db = ybe.VideoDatabase('videos.db')
+        self.store = ybe.VideoStore(ybe.get_all_videos(self.youtube, self.db), db=self.db)
+
+    def tearDown(self):
+        self.db.close()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def edit_title(self, vid, title):
+        self.youtube.store[vid]['snippet']['title'] = title
+        self.youtube.store[vid]['etag'] += '-edited'
+
+    def test_chunks_do_not_depend_on_the_order_videos_are_passed_in(self):
+        ybe.backup_videos(self.youtube, list(self.store))
+        chunks = ybe.BackupStore().load_state()['chunks']
+        ybe.backup_videos(self.youtube, reversed(list(self.store)))
+        self.assertEqual(ybe.BackupStore().load_state()['chunks'], chunks)
+
+    def test_restore_reads_the_newest_copy_from_its_segment(self):
+        vid = sorted(self.youtube.store)[-1]
+        ybe.backup_videos(self.youtube, self.store)
+        for n in range(3):
+            self.edit_title(vid, f"Edit {n}")
+            path, _, new = ybe.backup_videos(self.youtube, self.store)
+            self.assertEqual(new, 1)
+        items = list(ybe.iter_backup(path, {vid}))
+        self.assertEqual([item['snippet']['title'] for item in items], ["Edit 2"])
+        self.assertEqual(len(list(ybe.iter_backup(path))), 500)
+
+    def test_index_lines_without_offsets_still_restore(self):
+        path, _, _ = ybe.backup_videos(self.youtube, self.store)
+        backups = ybe.BackupStore()
+        with open(backups.index_path) as f:
+            digests = [line.split()[0] for line in f]
+        with open(backups.index_path, 'w') as f:
+            f.write(''.join(digest + '\n' for digest in digests))
+        self.assertEqual(len(list(ybe.iter_backup(path))), 500)
+
+if __name__ == '__main__':
+    unittest.main()
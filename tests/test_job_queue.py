@@ -0,0 +1,73 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_bulk_edit as ybe
+from mock_youtube_api import FakeYouTube
+
+FOOTER = "Follow the channel"
+
+class QueueTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.youtube = FakeYouTube(5, latency=0)
+        patches = [
+            mock.patch.object(ybe, 'get_credentials', lambda token: None),
+            mock.patch.object(ybe, 'build_service', lambda creds: self.youtube),
+            mock.patch.object(ybe, 'quota_ledger', ybe.QuotaLedger()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with open('settings.json', 'w') as f:
+            json.dump({'action': 'append', 'footer': FOOTER}, f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def cli(self, *argv):
+        with redirect_stdout(io.StringIO()):
+            return ybe.cli_main(['--metrics-dir', '', *argv])
+
+    def queue_all(self):
+        self.assertEqual(self.cli('sync'), ybe.EXIT_OK)
+        self.assertEqual(self.cli('schedule', '--settings', 'settings.json', '--all', '--enqueue-only'), ybe.EXIT_OK)
+
+    def test_videos_edited_after_queueing_are_not_reverted(self):
+        self.queue_all()
+        edited = sorted(self.youtube.store)[0]
+        self.youtube.store[edited]['snippet']['title'] = "Edited in Studio"
+        self.cli('queue', '--no-wait')
+        self.assertEqual(self.youtube.store[edited]['snippet']['title'], "Edited in Studio")
+        self.assertNotIn(FOOTER, self.youtube.store[edited]['snippet']['description'])
+        for vid, v in self.youtube.store.items():
+            if vid != edited:
+                self.assertEqual(v['snippet']['description'].count(FOOTER), 1)
+
+    def test_items_sent_before_a_crash_are_not_sent_again(self):
+        self.queue_all()
+        self.cli('queue', '--no-wait')
+        # A crash after the requests went out but before the queue recorded them as done
+        db = ybe.VideoDatabase(ybe.VIDEO_DB_FILE)
+        with db.conn:
+            db.conn.execute("UPDATE job_items SET state = 'pending'")
+        db.close()
+        updates = self.youtube.calls['videos.update']
+        self.cli('queue', '--no-wait')
+        self.assertEqual(self.youtube.calls['videos.update'], updates)
+        for v in self.youtube.store.values():
+            self.assertEqual(v['snippet']['description'].count(FOOTER), 1)
+        self.assertIsNone(ybe.UpdateJournal.find_run(ybe.JOURNAL_FILE))
+
+if __name__ == '__main__':
+    unittest.main()
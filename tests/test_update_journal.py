@@ -0,0 +1,102 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_bulk_edit as ybe
+from mock_youtube_api import FakeYouTube
+
+FOOTER = "Follow the channel"
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.youtube = FakeYouTube(5, latency=0)
+        patches = [
+            mock.patch.object(ybe, 'get_credentials', lambda token: None),
+            mock.patch.object(ybe, 'build_service', lambda creds: self.youtube),
+            mock.patch.object(ybe, 'quota_ledger', ybe.QuotaLedger()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with open('settings.json', 'w') as f:
+            json.dump({'action': 'append', 'footer': FOOTER}, f)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def cli(self, *argv):
+        with redirect_stdout(io.StringIO()):
+            return ybe.cli_main(['--metrics-dir', '', *argv])
+
+    def descriptions(self):
+        return {vid: v['snippet']['description'] for vid, v in self.youtube.store.items()}
+
+    def test_resume_after_lost_done_records_does_not_repeat_the_edit(self):
+        self.assertEqual(self.cli('sync'), ybe.EXIT_OK)
+        self.assertEqual(self.cli('apply', '--settings', 'settings.json', '--all'), ybe.EXIT_OK)
+        applied = self.descriptions()
+        # A crash before the batched fsync: every update was sent, but its 'done' record and the finish never landed
+        with open(ybe.JOURNAL_FILE) as f:
+            lines = [line for line in f if json.loads(line)['state'] not in ('done', 'finish')]
+        with open(ybe.JOURNAL_FILE, 'w') as f:
+            f.writelines(lines)
+        self.assertEqual(self.cli('resume'), ybe.EXIT_OK)
+        self.assertEqual(self.descriptions(), applied)
+        for description in applied.values():
+            self.assertEqual(description.count(FOOTER), 1)
+        self.assertIsNone(ybe.UpdateJournal.find_run(ybe.JOURNAL_FILE))
+
+    def test_resume_skips_videos_already_done(self):
+        self.cli('sync')
+        self.cli('apply', '--settings', 'settings.json', '--all')
+        with open(ybe.JOURNAL_FILE) as f:
+            lines = [line for line in f if json.loads(line)['state'] != 'finish']
+        with open(ybe.JOURNAL_FILE, 'w') as f:
+            f.writelines(lines)
+        updates = self.youtube.calls.get('videos.update', 0)
+        self.assertEqual(self.cli('resume'), ybe.EXIT_OK)
+        self.assertEqual(self.youtube.calls.get('videos.update', 0), updates)
+
+    def test_reapplying_a_thumbnail_plan_skips_videos_already_done(self):
+        # A JPEG header with a 1280x720 start-of-frame is all the thumbnail checks read
+        with open('thumb.jpg', 'wb') as f:
+            f.write(b'\xff\xd8\xff\xc0\x00\x11\x08\x02\xd0\x05\x00' + b'\x00' * 64)
+        with open('settings.json', 'w') as f:
+            json.dump({'action': 'none', 'thumbnail_path': 'thumb.jpg'}, f)
+        self.cli('sync')
+        self.assertEqual(self.cli('plan', '--settings', 'settings.json', '--all'), ybe.EXIT_OK)
+        self.assertEqual(self.cli('apply-plan'), ybe.EXIT_OK)
+        self.assertEqual(self.youtube.calls.get('thumbnails.set'), 5)
+        self.assertEqual(self.cli('apply-plan'), ybe.EXIT_OK)
+        self.assertEqual(self.youtube.calls.get('thumbnails.set'), 5)
+
+    def test_finished_runs_are_compacted_away(self):
+        self.cli('sync')
+        self.cli('apply', '--settings', 'settings.json', '--all')
+        self.cli('apply', '--settings', 'settings.json', '--all')
+        # Opening the journal for the second run dropped the first; opening it again drops the second
+        ybe.UpdateJournal(ybe.JOURNAL_FILE).close()
+        with open(ybe.JOURNAL_FILE) as f:
+            self.assertEqual(f.read(), '')
+
+    def test_run_ids_are_unique_for_the_same_edit(self):
+        journal = ybe.UpdateJournal(ybe.JOURNAL_FILE)
+        try:
+            run_ids = {journal.start_run({'action': 'append'}, ['a'], [], {}) for _ in range(5)}
+        finally:
+            journal.close()
+        self.assertEqual(len(run_ids), 5)
+
+if __name__ == '__main__':
+    unittest.main()
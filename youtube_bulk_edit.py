@@ -1,21 +1,28 @@
 import re
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.errors import HttpError
 import os
+import sys
+import argparse
 import pickle
-import tkinter as tk
-from tkinter import messagebox, scrolledtext, END, MULTIPLE, filedialog
-from tkinter import ttk
 import json
 import time
+import random
 import shutil  # For backing up tokens
 import csv
-import mimetypes
+import hashlib
+import bisect
+import difflib
+import io
+import itertools
+import gzip
+import sqlite3
 import threading
+import atexit
 import queue
-from datetime import datetime, date
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 
 SCOPES = ['https://www.googleapis.com/auth/youtube.force-ssl']
 
@@ -91,276 +98,3071 @@ API_COSTS = {
 # Quota tracking
 QUOTA_FILE = 'quota_tracker.json'
 DAILY_QUOTA_LIMIT = 10000
-estimated_units = 0
-last_quota_date = date.today()
+QUOTA_FLUSH_SECONDS = 2.0  # Quota usage is written at most this often
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo('America/Los_Angeles')
+except Exception:  # Python 3.8, or no tz database (Windows without tzdata)
+    PACIFIC = None
+
+def pacific_now():
+    now = datetime.now(timezone.utc)
+    if PACIFIC is not None:
+        return now.astimezone(PACIFIC)
+    # US rules: daylight time from 2am on the second Sunday of March to 2am on the first Sunday of November
+    march = datetime(now.year, 3, 8, 10, tzinfo=timezone.utc)
+    dst_start = march + timedelta(days=(6 - march.weekday()) % 7)
+    november = datetime(now.year, 11, 1, 9, tzinfo=timezone.utc)
+    dst_end = november + timedelta(days=(6 - november.weekday()) % 7)
+    offset = -7 if dst_start <= now < dst_end else -8
+    return now.astimezone(timezone(timedelta(hours=offset)))
+
+def next_quota_reset():
+    # YouTube resets daily quota at midnight Pacific time
+    now = pacific_now()
+    return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+class QuotaLedger:
+    # In-memory quota counters for the current Pacific day. add() only takes a lock and bumps counters;
+    # the file is rewritten atomically by a debounced background flush.
+    def __init__(self, path=QUOTA_FILE, limit=DAILY_QUOTA_LIMIT, flush_interval=QUOTA_FLUSH_SECONDS):
+        self.path = path
+        self.limit = limit
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.timer = None
+        self.dirty = False
+        self.start_day()
+
+    def start_day(self):
+        self.units = 0
+        self.by_method = {}
+        self.day = pacific_now().date()
+        self.reset_at = next_quota_reset().timestamp()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        with self.lock:
+            self.start_day()
+            if data.get('date') == self.day.strftime('%Y-%m-%d'):
+                self.units = data.get('units', 0)
+                self.by_method = data.get('methods', {})
+
+    def add(self, method, cost_multiplier=1):
+        cost = API_COSTS.get(method, 0) * cost_multiplier
+        with self.lock:
+            if time.time() >= self.reset_at:
+                self.start_day()
+            self.units += cost
+            self.by_method[method] = self.by_method.get(method, 0) + cost
+            self._schedule_flush()
+        return cost
+
+    def exhaust(self):
+        # Persisted like add(), so a restart after quotaExceeded does not believe budget is left
+        with self.lock:
+            if time.time() >= self.reset_at:
+                self.start_day()
+            self.units = max(self.units, self.limit)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        # Called with the lock held
+        if not self.dirty:
+            self.dirty = True
+            self.timer = threading.Timer(self.flush_interval, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def remaining(self):
+        if time.time() >= self.reset_at:
+            return self.limit
+        return self.limit - self.units
+
+    def snapshot(self):
+        with self.lock:
+            return {'date': self.day.strftime('%Y-%m-%d'), 'units': self.units, 'methods': dict(self.by_method)}
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None and self.timer is not threading.current_thread():
+                self.timer.cancel()
+            self.timer = None
+            self.dirty = False
+        data = self.snapshot()
+        with self.write_lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def flush_pending(self):
+        if self.dirty:
+            self.flush()
+
+quota_ledger = QuotaLedger()
+atexit.register(quota_ledger.flush_pending)
 
 def load_quota():
-    global estimated_units, last_quota_date
-    if os.path.exists(QUOTA_FILE):
-        with open(QUOTA_FILE, 'r') as f:
+    quota_ledger.load()
+
+def save_quota():
+    quota_ledger.flush()
+
+def add_quota_usage(method, cost_multiplier=1):
+    cost = quota_ledger.add(method, cost_multiplier)
+    api_metrics.record_quota(method, cost)
+    return cost
+
+def get_remaining_quota():
+    return quota_ledger.remaining()
+
+# The Google client libraries are imported on first use so the headless CLI starts quickly
+def get_credentials(token_file='token.pickle'):
+    creds = None
+    if os.path.exists(token_file):
+        with open(token_file, 'rb') as token:
+            creds = pickle.load(token)
+    if creds and not creds.valid and creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+        try:
+            creds.refresh(Request())
+        except Exception:
+            creds = None
+    if not creds or not creds.valid:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+        creds = flow.run_local_server(port=0)
+    with open(token_file, 'wb') as token:
+        pickle.dump(creds, token)
+    return creds
+
+USER_AGENT = 'youtube-bulk-edit (gzip)'  # Google serves gzip'd responses only to user agents containing "gzip"
+
+def build_service(creds):
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    from googleapiclient.http import set_user_agent
+    # httplib2 already sends Accept-Encoding: gzip and decompresses transparently
+    http = set_user_agent(AuthorizedHttp(creds, http=httplib2.Http()), USER_AGENT)
+    return build('youtube', 'v3', http=http)
+
+def get_authenticated_service(token_file='token.pickle'):
+    return build_service(get_credentials(token_file))
+
+# Retries
+RETRY_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 64.0
+RETRY_BUDGET_SECONDS = 300.0  # Most backoff one call may spend before giving up
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+def error_reason(error):
+    try:
+        return json.loads(error.content.decode('utf-8'))['error']['errors'][0]['reason']
+    except Exception:
+        return None
+
+def classify_error(error):
+    # 'quota' stops the run, 'rate_limit' and 'transient' are retried, anything else is raised at once
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return 'transient'
+    if not isinstance(error, HttpError):
+        return 'fatal'
+    reason = error_reason(error)
+    if reason in QUOTA_REASONS:
+        return 'quota'
+    if error.resp.status == 429 or reason in RATE_LIMIT_REASONS:
+        return 'rate_limit'
+    if error.resp.status in RETRYABLE_STATUSES:
+        return 'transient'
+    return 'fatal'
+
+def is_quota_error(error):
+    return classify_error(error) == 'quota'
+
+def retry_after(error):
+    try:
+        return max(0.0, float(error.resp.get('retry-after')))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+# API metrics
+METRICS_DIR = 'metrics'
+PROMETHEUS_FILE = 'youtube_bulk_edit.prom'
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def call_outcome(error):
+    if isinstance(error, HttpError) and error.resp.status == 304:
+        return 'not_modified'
+    return classify_error(error)
+
+class ApiMetrics:
+    # Per-method call outcomes, latency histogram, retries, backoff, bytes and quota units for this process
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.methods = {}
+        self.giveups = 0
+
+    def _method(self, method):
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = {
+                'calls': 0, 'outcomes': {}, 'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'seconds': 0.0,
+                'retries': {}, 'backoffSeconds': 0.0, 'bytesSent': 0, 'bytesReceived': 0, 'quotaUnits': 0
+            }
+        return stats
+
+    def record_call(self, method, seconds=None, outcome='ok'):
+        # seconds is None for batch sub-requests, whose round trip is timed under 'batch'
+        with self.lock:
+            stats = self._method(method)
+            stats['calls'] += 1
+            stats['outcomes'][outcome] = stats['outcomes'].get(outcome, 0) + 1
+            if seconds is not None:
+                stats['seconds'] += seconds
+                stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def mean_seconds(self, method):
+        with self.lock:
+            stats = self.methods.get(method)
+            timed = sum(stats['buckets']) if stats else 0
+            return stats['seconds'] / timed if timed else None
+
+    def record_retry(self, method, kind, delay):
+        with self.lock:
+            stats = self._method(method)
+            stats['retries'][kind] = stats['retries'].get(kind, 0) + 1
+            stats['backoffSeconds'] += delay
+
+    def record_giveup(self):
+        with self.lock:
+            self.giveups += 1
+
+    def record_bytes(self, method, sent=0, received=0):
+        with self.lock:
+            stats = self._method(method)
+            stats['bytesSent'] += sent
+            stats['bytesReceived'] += received
+
+    def record_quota(self, method, units):
+        with self.lock:
+            self._method(method)['quotaUnits'] += units
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.methods))
+
+    def summary(self):
+        with self.lock:
+            retries = sorted((method, kind, count) for method, stats in self.methods.items() for kind, count in stats['retries'].items())
+            if not retries and not self.giveups:
+                return "No retries"
+            backoff = sum(stats['backoffSeconds'] for stats in self.methods.values())
+            parts = ', '.join(f"{method} {kind} x{count}" for method, kind, count in retries)
+            return f"Retries: {parts or 'none'}; {backoff:.1f}s lost to backoff; {self.giveups} gave up"
+
+    def prometheus_text(self):
+        methods = self.snapshot()
+        lines = ['# HELP youtube_api_request_seconds API request latency', '# TYPE youtube_api_request_seconds histogram']
+        for method, stats in sorted(methods.items()):
+            total = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), stats['buckets']):
+                total += count
+                lines.append(f'youtube_api_request_seconds_bucket{{method="{method}",le="{bound}"}} {total}')
+            lines.append(f'youtube_api_request_seconds_sum{{method="{method}"}} {stats["seconds"]:.6f}')
+            lines.append(f'youtube_api_request_seconds_count{{method="{method}"}} {total}')
+        counters = [
+            ('youtube_api_calls_total', "API calls by outcome", lambda stats: [(f'outcome="{k}"', v) for k, v in stats['outcomes'].items()]),
+            ('youtube_api_retries_total', "Retried API calls by reason", lambda stats: [(f'reason="{k}"', v) for k, v in stats['retries'].items()]),
+            ('youtube_api_backoff_seconds_total', "Time spent waiting between retries", lambda stats: [('', stats['backoffSeconds'])]),
+            ('youtube_api_bytes_sent_total', "Request bytes sent", lambda stats: [('', stats['bytesSent'])]),
+            ('youtube_api_bytes_received_total', "Decoded response bytes received", lambda stats: [('', stats['bytesReceived'])]),
+            ('youtube_api_quota_units_total', "Quota units charged", lambda stats: [('', stats['quotaUnits'])]),
+        ]
+        for name, help_text, samples in counters:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for method, stats in sorted(methods.items()):
+                for labels, value in samples(stats):
+                    lines.append(f'{name}{{method="{method}"{"," + labels if labels else ""}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export_prometheus(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+api_metrics = ApiMetrics()
+
+def metrics_delta(before, after):
+    delta = {}
+    for method, stats in after.items():
+        base = before.get(method, {})
+        entry = {}
+        for key, value in stats.items():
+            old = base.get(key)
+            if isinstance(value, dict):
+                entry[key] = {k: v - (old or {}).get(k, 0) for k, v in value.items() if v != (old or {}).get(k, 0)}
+            elif isinstance(value, list):
+                entry[key] = [v - o for v, o in zip(value, old or [0] * len(value))]
+            else:
+                entry[key] = value - (old or 0)
+        if entry['calls'] or entry['quotaUnits']:
+            timed = sum(entry['buckets'])
+            entry['meanSeconds'] = round(entry['seconds'] / timed, 4) if timed else None
+            delta[method] = entry
+    return delta
+
+def save_job_metrics(name, before, started, directory=METRICS_DIR):
+    # One JSON summary per job, plus a refreshed Prometheus text file covering the whole process. The per-job
+    # numbers are the change in the process-wide counters while the job ran, so jobs that overlap (GUI tasks
+    # on different lanes) each include the other's calls.
+    os.makedirs(directory, exist_ok=True)
+    summary = {
+        'job': name,
+        'started': datetime.fromtimestamp(started, timezone.utc).isoformat(),
+        'wallSeconds': round(time.time() - started, 3),
+        'latencyBuckets': list(LATENCY_BUCKETS),
+        'methods': metrics_delta(before, api_metrics.snapshot()),
+    }
+    path = os.path.join(directory, f"{name}-{datetime.fromtimestamp(started).strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    api_metrics.export_prometheus(os.path.join(directory, PROMETHEUS_FILE))
+    return path
+
+def count_request_bytes(request, method):
+    # Bytes sent are the JSON body plus any media; bytes received are counted as the client decodes each response
+    sent = len(getattr(request, 'body', None) or '')
+    resumable = getattr(request, 'resumable', None)
+    if resumable is not None:
+        sent += resumable.size() or 0
+    api_metrics.record_bytes(method, sent=sent)
+    postproc = getattr(request, 'postproc', None)
+    if postproc is not None:
+        def counted(resp, content):
+            api_metrics.record_bytes(method, received=len(content or b''))
+            return postproc(resp, content)
+        request.postproc = counted
+    return request
+
+class RetryPolicy:
+    # Exponential backoff with full jitter, stretched to the server's Retry-After when it sends one
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+                 budget_seconds=RETRY_BUDGET_SECONDS, stats=api_metrics):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_seconds = budget_seconds
+        self.stats = stats
+
+    def delay(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        server_delay = retry_after(error)
+        return max(delay, server_delay) if server_delay is not None else delay
+
+    def call(self, method, func):
+        spent = 0.0
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                self.stats.record_call(method, time.monotonic() - started, call_outcome(e))
+                kind = classify_error(e)
+                if kind == 'quota':
+                    quota_ledger.exhaust()  # The API knows better than the local estimate
+                    raise
+                if kind == 'fatal':
+                    raise
+                delay = self.delay(attempt, e)
+                attempt += 1
+                if attempt >= self.max_attempts or spent + delay > self.budget_seconds:
+                    self.stats.record_giveup()
+                    raise
+                self.stats.record_retry(method, kind, delay)
+                time.sleep(delay)
+                spent += delay
+                continue
+            self.stats.record_call(method, time.monotonic() - started)
+            return result
+
+retry_policy = RetryPolicy()
+
+def execute_request(request, method):
+    count_request_bytes(request, method)
+    response = retry_policy.call(method, request.execute)
+    add_quota_usage(method)
+    return response
+
+# Concurrency and rate limiting
+MAX_WORKERS = 4
+REQUESTS_PER_SECOND = 5.0
+QUOTA_UNITS_PER_SECOND = 250.0
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        if self.rate <= 0:  # Unlimited
+            return
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+class RateLimiter:
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND, units_per_second=QUOTA_UNITS_PER_SECOND):
+        self.requests = TokenBucket(requests_per_second)
+        self.units = TokenBucket(units_per_second)
+
+    def acquire(self, method):
+        self.requests.acquire(1)
+        self.units.acquire(API_COSTS.get(method, 0))
+
+class UpdateEngine:
+    # googleapiclient service objects are not thread-safe, so every worker builds its own
+    def __init__(self, service_factory, max_workers=MAX_WORKERS, limiter=None):
+        self.service_factory = service_factory
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter()
+
+    def run(self, items, func, progress_callback=None, result_callback=None, token=None):
+        local = threading.local()
+        quota_errors = []
+
+        def work(item):
+            if token is not None:
+                token.check()
+            if quota_errors:
+                raise quota_errors[0]  # Every further call would fail the same way and still cost quota
+            if not hasattr(local, 'youtube'):
+                local.youtube = self.service_factory()
+            try:
+                return func(local.youtube, item)
+            except Exception as e:
+                if is_quota_error(e):
+                    quota_errors.append(e)
+                raise
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(work, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    results.append((futures[future], future.result(), None))
+                except Exception as e:
+                    results.append((futures[future], None, e))
+                if result_callback:
+                    result_callback(*results[-1])
+                if progress_callback:
+                    progress_callback(len(results), len(futures))
+        return results
+
+# Background tasks
+INTERACTIVE_WORKERS = 2
+BULK_WORKERS = 1  # Bulk tasks run one after another; the quota scheduler runs beside them, on the same rate limiter
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+class TaskCancelled(Exception):
+    pass
+
+class TaskToken:
+    # Checked by bulk loops between items: cancel() stops them at the next check, pause() holds them there
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.running = threading.Event()
+        self.running.set()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.running.set()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def is_paused(self):
+        return not self.running.is_set()
+
+    def check(self):
+        self.running.wait()
+        if self.cancelled.is_set():
+            raise TaskCancelled("Cancelled")
+
+class ProgressReporter:
+    # Wraps a (done, total, eta_seconds) callback as the (done, total) progress callback the engine calls
+    def __init__(self, callback):
+        self.callback = callback
+        self.started = time.monotonic()
+
+    def __call__(self, done, total):
+        elapsed = time.monotonic() - self.started
+        eta = elapsed / done * (total - done) if done else None
+        self.callback(done, total, eta)
+
+def format_progress(done, total, eta):
+    if eta is None:
+        return f"{done}/{total}"
+    minutes, seconds = divmod(int(eta), 60)
+    return f"{done}/{total}, about {minutes}m {seconds:02d}s left"
+
+class TaskExecutor:
+    # Separate worker lanes so a multi-hour bulk job never blocks interactive work; within a lane lower
+    # priority numbers run first. Results and errors are handed to dispatch (root.after in the GUI).
+    def __init__(self, lanes=None, dispatch=None, on_error=None):
+        lanes = lanes or {'interactive': INTERACTIVE_WORKERS, 'bulk': BULK_WORKERS}
+        self.dispatch = dispatch or (lambda func, *args: func(*args))
+        self.on_error = on_error
+        self.counter = itertools.count()
+        self.queues = {}
+        for lane, workers in lanes.items():
+            self.queues[lane] = queue.PriorityQueue()
+            for _ in range(workers):
+                threading.Thread(target=self.worker, args=(lane,), daemon=True).start()
+
+    def submit(self, func, args=(), callback=None, lane='interactive', priority=PRIORITY_NORMAL, token=None):
+        token = token or TaskToken()
+        self.queues[lane].put((priority, next(self.counter), func, args, callback, token))
+        return token
+
+    def worker(self, lane):
+        tasks = self.queues[lane]
+        while True:
+            _, _, func, args, callback, token = tasks.get()
+            try:
+                token.check()
+                result = func(*args)
+                if callback:
+                    self.dispatch(callback, result)
+            except Exception as e:
+                if self.on_error:
+                    self.dispatch(self.on_error, e)
+            finally:
+                tasks.task_done()
+
+# Partial responses: each list call asks only for the fields it reads
+CHANNEL_TITLE_FIELDS = 'items/snippet/title'
+UPLOADS_PLAYLIST_FIELDS = 'items/contentDetails/relatedPlaylists/uploads'
+
+def get_current_channel(youtube):
+    try:
+        request = youtube.channels().list(
+            part="snippet",
+            mine=True,
+            fields=CHANNEL_TITLE_FIELDS
+        )
+        response = execute_request(request, 'channels.list')
+        return response['items'][0]['snippet']['title']
+    except Exception as e:
+        return "Unknown (Error: " + str(e) + ")"
+
+def get_uploads_playlist_id(youtube, cache_file='playlist_id_cache.json'):
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r') as f:
             data = json.load(f)
-            last_date_str = data.get('date')
-            if last_date_str:
-                last_quota_date = datetime.strptime(last_date_str, '%Y-%m-%d').date()
-            estimated_units = data.get('units', 0)
-            if last_quota_date < date.today():
-                estimated_units = 0
-                last_quota_date = date.today()
-                save_quota()
+        return data['playlist_id']
+    request = youtube.channels().list(
+        part="contentDetails",
+        mine=True,
+        fields=UPLOADS_PLAYLIST_FIELDS
+    )
+    response = execute_request(request, 'channels.list')
+    playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+    with open(cache_file, 'w') as f:
+        json.dump({'playlist_id': playlist_id}, f)
+    return playlist_id
+
+# Search
+SEARCH_WORD_RE = re.compile(r'\w+')
+SEARCH_DEBOUNCE_MS = 150
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+class SearchIndex:
+    # Word postings over title, description, tags and ID, plus a trigram index over the vocabulary,
+    # so a substring query only scans the words that can contain it instead of every description
+    def __init__(self, videos=()):
+        self.lock = threading.Lock()
+        self.build(videos)
+
+    def build(self, videos):
+        postings = {}
+        grams = {}
+        doc_words = {}
+        for v in videos:
+            words = self.video_words(v)
+            doc_words[v['id']] = words
+            for word in words:
+                if word not in postings:
+                    postings[word] = set()
+                    for gram in trigrams(word):
+                        grams.setdefault(gram, set()).add(word)
+                postings[word].add(v['id'])
+        with self.lock:
+            self.postings, self.grams, self.doc_words = postings, grams, doc_words
+
+    @staticmethod
+    def video_words(v):
+        text = ' '.join([v['title'], v.get('description', ''), ' '.join(v.get('tags', []))]).lower()
+        words = set(SEARCH_WORD_RE.findall(text))
+        words.add(v['id'].lower())
+        return words
+
+    def add(self, v):
+        words = self.video_words(v)
+        with self.lock:
+            self._remove(v['id'])
+            self.doc_words[v['id']] = words
+            for word in words:
+                if word not in self.postings:
+                    self.postings[word] = set()
+                    for gram in trigrams(word):
+                        self.grams.setdefault(gram, set()).add(word)
+                self.postings[word].add(v['id'])
+
+    def remove(self, video_id):
+        with self.lock:
+            self._remove(video_id)
+
+    def _remove(self, video_id):
+        for word in self.doc_words.pop(video_id, ()):
+            ids = self.postings[word]
+            ids.discard(video_id)
+            if not ids:
+                del self.postings[word]
+                for gram in trigrams(word):
+                    self.grams[gram].discard(word)
+                    if not self.grams[gram]:
+                        del self.grams[gram]
+
+    def _words_containing(self, fragment):
+        if len(fragment) < 3:
+            return [word for word in self.postings if fragment in word]
+        candidates = sorted((self.grams.get(gram, set()) for gram in trigrams(fragment)), key=len)
+        words = candidates[0].intersection(*candidates[1:])
+        return [word for word in words if fragment in word]
+
+    def search(self, query, candidates=None):
+        # Every word of the query must occur inside some word of the video; returns None for an empty query.
+        # Passing the result of a shorter query as candidates narrows it instead of starting over.
+        fragments = sorted(set(SEARCH_WORD_RE.findall(query.lower())), key=len, reverse=True)
+        if not fragments:
+            return None
+        result = set(candidates) if candidates is not None else None
+        with self.lock:
+            for fragment in fragments:
+                ids = set()
+                for word in self._words_containing(fragment):
+                    ids |= self.postings[word]
+                result = ids if result is None else result & ids
+                if not result:
+                    break
+        return result
+
+# Video records
+VIDEO_KEYS = ('id', 'title', 'description', 'tags', 'categoryId', 'defaultLanguage', 'publishedAt', 'status', 'recordingDate', 'lastUpdated')
+VIDEO_STATUS_KEYS = ('privacyStatus', 'license', 'embeddable', 'publicStatsViewable', 'selfDeclaredMadeForKids', 'publishAt')
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class VideoStatus(MutableMapping):
+    # Write-through dict view of a record's status fields; a field stored as None is absent
+    __slots__ = ('record',)
+
+    def __init__(self, record):
+        self.record = record
+
+    def __getitem__(self, key):
+        value = getattr(self.record, key) if key in VIDEO_STATUS_KEYS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in VIDEO_STATUS_KEYS:
+            raise KeyError(key)
+        setattr(self.record, key, intern_text(value))
+
+    def __delitem__(self, key):
+        self[key]
+        setattr(self.record, key, None)
+
+    def __iter__(self):
+        return (key for key in VIDEO_STATUS_KEYS if getattr(self.record, key) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class VideoRecord:
+    # A video in slots instead of a dict, indexed like one (v['title'], v.get('status', {}), v['tags'] = ...).
+    # Tags, category, language and status values are interned, since a few distinct strings repeat across
+    # the whole channel. Once a record is saved to the video database its description is dropped and read
+    # back from there on access, so descriptions are not all held in memory.
+    __slots__ = ('id', 'title', '_description', 'source', '_tags', '_categoryId', '_defaultLanguage', 'publishedAt',
+                 'recordingDate', 'lastUpdated') + VIDEO_STATUS_KEYS
+
+    def __init__(self, id, title, description=None, tags=(), categoryId=None, defaultLanguage='', publishedAt='',
+                 status=None, recordingDate='', lastUpdated=None, source=None):
+        self.id = id
+        self.title = title
+        self._description = description
+        self.source = source
+        self.tags = tags
+        self.categoryId = categoryId
+        self.defaultLanguage = defaultLanguage
+        self.publishedAt = publishedAt
+        self.status = status or {}
+        self.recordingDate = recordingDate
+        self.lastUpdated = lastUpdated
+
+    @classmethod
+    def from_dict(cls, v):
+        return cls(v['id'], v['title'], v.get('description', ''), v.get('tags') or (), v.get('categoryId'),
+                   v.get('defaultLanguage', ''), v.get('publishedAt', ''), v.get('status'), v.get('recordingDate', ''),
+                   v.get('lastUpdated'))
+
+    @property
+    def description(self):
+        if self._description is not None:
+            return self._description
+        return self.source.load_description(self.id) if self.source is not None else ''
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+
+    def release_description(self, source):
+        self.source = source
+        self._description = None
+
+    @property
+    def tags(self):
+        return list(self._tags)
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = tuple(sys.intern(tag) for tag in value)
+
+    @property
+    def categoryId(self):
+        return self._categoryId
+
+    @categoryId.setter
+    def categoryId(self, value):
+        self._categoryId = intern_text(value)
+
+    @property
+    def defaultLanguage(self):
+        return self._defaultLanguage
+
+    @defaultLanguage.setter
+    def defaultLanguage(self, value):
+        self._defaultLanguage = intern_text(value)
+
+    @property
+    def status(self):
+        return VideoStatus(self)
+
+    @status.setter
+    def status(self, value):
+        values = dict(value)
+        for key in VIDEO_STATUS_KEYS:
+            setattr(self, key, intern_text(values.get(key)))
+
+    def __getitem__(self, key):
+        if key not in VIDEO_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in VIDEO_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in VIDEO_KEYS
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in VIDEO_KEYS else default
+
+    def keys(self):
+        return VIDEO_KEYS
+
+    def update(self, fields):
+        for key, value in dict(fields).items():
+            self[key] = value
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in VIDEO_KEYS}
+        data['status'] = dict(self.status)
+        return data
+
+    def __repr__(self):
+        return f"VideoRecord({self.id!r}, {self.title!r})"
+
+class VideoStore:
+    # Channel videos in display order plus an index by ID; the records are shared so in-place edits stay visible through both.
+    # With a VideoDatabase attached, edits made through update() and save() are written back immediately,
+    # and an attached SearchIndex is kept in step the same way.
+    def __init__(self, videos=(), db=None, search_index=None):
+        self.db = db
+        self.search_index = search_index
+        self.replace(videos)
+
+    def replace(self, videos):
+        self.videos = []
+        self.index = {}
+        for v in videos:
+            if v['id'] not in self.index:
+                if not isinstance(v, VideoRecord):
+                    v = VideoRecord.from_dict(v)
+                self.index[v['id']] = v
+                self.videos.append(v)
+        if self.search_index is not None:
+            self.search_index.build(self.videos)
+
+    def get(self, video_id):
+        return self.index.get(video_id)
+
+    def get_many(self, video_ids):
+        return [self.index[vid] for vid in video_ids if vid in self.index]
+
+    def update(self, video_id, fields):
+        v = self.index.get(video_id)
+        if v is not None:
+            v.update(fields)
+            self.save(v)
+        return v
+
+    def save(self, *vids):
+        if self.db is not None:
+            self.db.upsert_videos(vids)
+        if self.search_index is not None:
+            for v in vids:
+                self.search_index.add(v)
+
+    def __iter__(self):
+        return iter(self.videos)
+
+    def __len__(self):
+        return len(self.videos)
+
+    def __contains__(self, video_id):
+        return video_id in self.index
+
+# Batched videos.list
+VIDEOS_PER_REQUEST = 50  # API maximum for the id filter
+REQUESTS_PER_BATCH = 50  # Sub-requests per multipart batch round trip
+VIDEO_FIELDS = ('etag,items(id,snippet(title,description,tags,categoryId,defaultLanguage,publishedAt),'
+                'status(privacyStatus,license,embeddable,publicStatsViewable,selfDeclaredMadeForKids,publishAt),'
+                'recordingDetails/recordingDate)')
+VIEW_COUNT_FIELDS = 'items(id,statistics/viewCount)'
+
+def video_chunk_key(chunk):
+    return hashlib.sha1(','.join(chunk).encode()).hexdigest()
+
+def iter_video_chunks(youtube, chunks, part="snippet,status,recordingDetails", etags=None, requests_per_batch=REQUESTS_PER_BATCH,
+                      fields=VIDEO_FIELDS):
+    # Yields the (chunk, response) pairs of each batch round trip; response is None when the
+    # chunk's stored ETag still matches (HTTP 304). fields=None returns the parts in full.
+    etags = etags or {}
+    for i in range(0, len(chunks), requests_per_batch):
+        group = chunks[i:i + requests_per_batch]
+        responses = [None] * len(group)
+        failed = []
+
+        def callback(request_id, response, exception, responses=responses, failed=failed):
+            api_metrics.record_call('videos.list', outcome='ok' if exception is None else call_outcome(exception))
+            if exception is not None:
+                if isinstance(exception, HttpError) and exception.resp.status == 304:
+                    add_quota_usage('videos.list')
+                else:
+                    failed.append(int(request_id))
+                return
+            add_quota_usage('videos.list')
+            responses[int(request_id)] = response
+
+        def make_request(chunk):
+            if fields:
+                request = youtube.videos().list(part=part, id=','.join(chunk), fields=fields)
+            else:
+                request = youtube.videos().list(part=part, id=','.join(chunk))
+            etag = etags.get(video_chunk_key(chunk))
+            if etag:
+                request.headers['If-None-Match'] = etag
+            return count_request_bytes(request, 'videos.list')
+
+        batch = youtube.new_batch_http_request(callback=callback)
+        for n, chunk in enumerate(group):
+            batch.add(make_request(chunk), request_id=str(n))
+        retry_policy.call('batch', batch.execute)
+        # Failed sub-requests are retried on their own so a single 429 does not drop 50 videos
+        for n in failed:
+            try:
+                responses[n] = execute_request(make_request(group[n]), 'videos.list')
+            except HttpError as e:
+                if e.resp.status != 304:
+                    raise
+                add_quota_usage('videos.list')
+        yield list(zip(group, responses))
+
+def iter_video_batches(youtube, video_ids, part="snippet,status,recordingDetails", requests_per_batch=REQUESTS_PER_BATCH,
+                       fields=VIDEO_FIELDS):
+    chunks = [video_ids[i:i + VIDEOS_PER_REQUEST] for i in range(0, len(video_ids), VIDEOS_PER_REQUEST)]
+    for results in iter_video_chunks(youtube, chunks, part, requests_per_batch=requests_per_batch, fields=fields):
+        items = {}
+        for _, response in results:
+            for item in response.get('items', []):
+                items[item['id']] = item
+        yield items
+
+def merge_video_item(v, item):
+    snippet = item['snippet']
+    v['title'] = snippet.get('title', v['title'])
+    v['description'] = snippet.get('description', v['description'])
+    v['tags'] = snippet.get('tags', [])
+    v['categoryId'] = snippet.get('categoryId', v['categoryId'])
+    v['defaultLanguage'] = snippet.get('defaultLanguage', v['defaultLanguage'])
+    v['status'] = item['status']
+    v['recordingDate'] = item.get('recordingDetails', {}).get('recordingDate', '')
+    v['publishedAt'] = snippet.get('publishedAt', v['publishedAt'])
+
+# Local video database
+VIDEO_DB_FILE = 'videos.db'
+LEGACY_CACHE_FILE = 'videos_cache.json'
+
+VIDEO_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    category_id TEXT,
+    default_language TEXT,
+    published_at TEXT,
+    privacy_status TEXT,
+    status_json TEXT,
+    recording_date TEXT,
+    last_updated TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_videos_privacy ON videos (privacy_status);
+CREATE INDEX IF NOT EXISTS idx_videos_category ON videos (category_id);
+CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (published_at);
+CREATE TABLE IF NOT EXISTS tags (
+    video_id TEXT NOT NULL REFERENCES videos (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (video_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags (tag);
+CREATE TABLE IF NOT EXISTS chunks (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class VideoDatabase:
+    # One shared connection guarded by a lock; WAL keeps per-video commits cheap
+    def __init__(self, path=VIDEO_DB_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(VIDEO_DB_SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+
+    def video_ids(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute('SELECT id FROM videos')]
+
+    def load_videos(self):
+        # Descriptions stay on disk until a record asks for one
+        with self.lock:
+            tags = {}
+            for video_id, tag in self.conn.execute('SELECT video_id, tag FROM tags ORDER BY video_id, position'):
+                tags.setdefault(video_id, []).append(tag)
+            rows = self.conn.execute(
+                'SELECT id, title, category_id, default_language, published_at, status_json, recording_date, last_updated FROM videos'
+            ).fetchall()
+        return [VideoRecord(row[0], row[1], None, tags.get(row[0], ()), row[2], row[3] or '', row[4] or '',
+                            json.loads(row[5]) if row[5] else None, row[6] or '', row[7], source=self)
+                for row in rows]
+
+    def load_description(self, video_id):
+        with self.lock:
+            row = self.conn.execute('SELECT description FROM videos WHERE id = ?', (video_id,)).fetchone()
+        if row is None:
+            # Removed by a sync while a record was still in use; an empty description would be sent as real
+            raise LookupError(f"Video {video_id} is no longer in the local database")
+        return row[0]
+
+    def upsert_videos(self, videos):
+        rows = []
+        tag_rows = []
+        for v in videos:
+            status = dict(v.get('status') or {})
+            rows.append((v['id'], v['title'], v.get('description', ''), v.get('categoryId'), v.get('defaultLanguage', ''),
+                         v.get('publishedAt', ''), status.get('privacyStatus'), json.dumps(status), v.get('recordingDate', ''),
+                         v.get('lastUpdated')))
+            tag_rows.extend((v['id'], n, tag) for n, tag in enumerate(v.get('tags', [])))
+        if not rows:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO videos (id, title, description, category_id, default_language, published_at, privacy_status, status_json, recording_date, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    title = excluded.title, description = excluded.description, category_id = excluded.category_id,
+                    default_language = excluded.default_language, published_at = excluded.published_at,
+                    privacy_status = excluded.privacy_status, status_json = excluded.status_json,
+                    recording_date = excluded.recording_date, last_updated = excluded.last_updated
+            """, rows)
+            self.conn.executemany('DELETE FROM tags WHERE video_id = ?', [(row[0],) for row in rows])
+            self.conn.executemany('INSERT INTO tags (video_id, position, tag) VALUES (?, ?, ?)', tag_rows)
+        for v in videos:
+            if isinstance(v, VideoRecord):
+                v.release_description(self)
+
+    def delete_videos(self, video_ids):
+        with self.lock, self.conn:
+            self.conn.executemany('DELETE FROM videos WHERE id = ?', [(vid,) for vid in video_ids])
+
+    def load_chunks(self):
+        with self.lock:
+            return {key: {'etag': etag, 'checkedAt': checked_at}
+                    for key, etag, checked_at in self.conn.execute('SELECT key, etag, checked_at FROM chunks')}
+
+    def replace_chunks(self, chunks):
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM chunks')
+            self.conn.executemany('INSERT INTO chunks (key, etag, checked_at) VALUES (?, ?, ?)',
+                                  [(key, state.get('etag'), state['checkedAt']) for key, state in chunks.items()])
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    def import_json_cache(self, cache_file=LEGACY_CACHE_FILE):
+        # One-time migration from videos_cache.json
+        if not os.path.exists(cache_file):
+            return 0
+        with open(cache_file, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            videos, chunks, synced_at = data, {}, os.path.getmtime(cache_file)
+        else:
+            videos, chunks, synced_at = data['videos'], data.get('chunks', {}), data.get('syncedAt', 0)
+        self.upsert_videos(videos)
+        self.replace_chunks(chunks)
+        self.set_meta('syncedAt', synced_at)
+        return len(videos)
+
+# Incremental sync
+UPLOAD_PAGES_AHEAD = 20  # Playlist pages the paging thread may fetch before enrichment catches up
+PLAYLIST_PAGE_FIELDS = 'nextPageToken,items/snippet(title,description,publishedAt,resourceId/videoId)'
+
+def iter_upload_pages(youtube, playlist_id, known_ids=()):
+    # Yields the uncached videos of each playlist page. The uploads playlist lists newest first,
+    # so paging stops at the first page that reaches a cached video
+    next_page_token = None
+    while True:
+        request = youtube.playlistItems().list(
+            part="snippet",
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=next_page_token,
+            fields=PLAYLIST_PAGE_FIELDS
+        )
+        response = execute_request(request, 'playlistItems.list')
+        reached_known = False
+        videos = []
+        for item in response['items']:
+            vid = item['snippet']['resourceId']['videoId']
+            if vid in known_ids:
+                reached_known = True
+                continue
+            snippet = item['snippet']
+            videos.append(VideoRecord(
+                vid,
+                snippet['title'],
+                snippet['description'],
+                snippet.get('tags', ()),
+                snippet.get('categoryId', '22'),
+                snippet.get('defaultLanguage', ''),
+                snippet.get('publishedAt', ''),
+            ))
+        yield videos
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token or reached_known:
+            break
+
+def iter_prefetched(items, max_group, ahead=UPLOAD_PAGES_AHEAD):
+    # Runs the items generator on its own thread and yields whatever it has produced so far
+    # (at least one item, at most max_group), so the consumer never waits on the producer's next round trip
+    pending = queue.Queue(maxsize=ahead)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        else:
+            put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            group = [pending.get()]
+            while len(group) < max_group and group[-1] is not done and not isinstance(group[-1], Exception):
+                try:
+                    group.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            last = group[-1]
+            if last is done or isinstance(last, Exception):
+                group.pop()
+            if group:
+                yield group
+            if isinstance(last, Exception):
+                raise last
+            if last is done:
+                return
+    finally:
+        stop.set()
+
+def iter_page_groups(pages, max_group):
+    # Without a second connection nothing overlaps, so after a first page on its own (for early rows)
+    # pages are enriched max_group at a time in a single batch round trip
+    group = []
+    first = True
+    for page in pages:
+        group.append(page)
+        if first or len(group) == max_group:
+            yield group
+            group = []
+            first = False
+    if group:
+        yield group
+
+def enrich_upload_pages(youtube, page_groups, on_videos=None):
+    # Each group of playlist pages gets one batched videos.list round trip, with one chunk per page.
+    # Videos missing from the response were deleted after their page was read and are dropped.
+    videos = []
+    for group in page_groups:
+        partial = {v['id']: v for page in group for v in page}
+        chunks = [[v['id'] for v in page] for page in group if page]
+        enriched = []
+        for results in iter_video_chunks(youtube, chunks):
+            for chunk, response in results:
+                items = {item['id']: item for item in response.get('items', [])}
+                for vid in chunk:
+                    if vid in items:
+                        merge_video_item(partial[vid], items[vid])
+                        enriched.append(partial[vid])
+        videos.extend(enriched)
+        if on_videos and enriched:
+            on_videos(enriched)
+    return videos
+
+def sync_video_chunks(youtube, store, chunk_state, max_age_hours, fresh_ids=()):
+    # Videos are checked in fixed chunks ordered oldest first, so new uploads only disturb the last chunk.
+    # A chunk is re-requested once it is older than max_age_hours, conditionally on its last ETag.
+    # Chunks made up only of fresh_ids were just fetched while paging and are not requested again.
+    ordered = sorted(store, key=lambda v: (v.get('publishedAt', ''), v['id']))
+    ids = [v['id'] for v in ordered]
+    now = time.time()
+    new_state = {}
+    due = []
+    for i in range(0, len(ids), VIDEOS_PER_REQUEST):
+        chunk = ids[i:i + VIDEOS_PER_REQUEST]
+        key = video_chunk_key(chunk)
+        state = chunk_state.get(key)
+        if state and now - state['checkedAt'] < max_age_hours * 3600:
+            new_state[key] = state
+        elif fresh_ids and all(vid in fresh_ids for vid in chunk):
+            new_state[key] = {'etag': None, 'checkedAt': now}
+        else:
+            due.append(chunk)
+    etags = {key: state['etag'] for key, state in chunk_state.items() if state.get('etag')}
+    changed = []
+    removed = set()
+    for results in iter_video_chunks(youtube, due, etags=etags):
+        for chunk, response in results:
+            key = video_chunk_key(chunk)
+            if response is None:  # Not modified
+                new_state[key] = {'etag': etags.get(key), 'checkedAt': now}
+                continue
+            items = {item['id']: item for item in response.get('items', [])}
+            for vid in chunk:
+                if vid in items:
+                    merge_video_item(store.get(vid), items[vid])
+                    changed.append(store.get(vid))
+                else:
+                    removed.add(vid)  # Deleted from the channel
+            new_state[key] = {'etag': response.get('etag'), 'checkedAt': now}
+    if removed:
+        store.replace([v for v in store if v['id'] not in removed])
+    return new_state, changed, removed
+
+def get_all_videos(youtube, db, cache_expiry_hours=24, refresh=False, incremental=True, service_factory=None, on_videos=None):
+    # on_videos receives lists of videos as they load. With a service_factory the playlist is paged on
+    # a separate connection while the previous pages are enriched, instead of paging everything first.
+    if not db.count():
+        db.import_json_cache()
+    synced_at = float(db.get_meta('syncedAt', 0))
+    if not refresh and time.time() - synced_at < cache_expiry_hours * 3600 and db.count():
+        videos = db.load_videos()
+        videos.sort(key=lambda x: x['title'].lower())
+        return videos
+    playlist_id = get_uploads_playlist_id(youtube)
+    if incremental:
+        store = VideoStore(db.load_videos())
+        chunk_state = db.load_chunks()
+    else:
+        store = VideoStore()
+        chunk_state = {}
+    if on_videos and len(store):
+        on_videos(list(store.videos))
+    if service_factory:
+        pages = iter_upload_pages(service_factory(), playlist_id, store.index)
+        page_groups = iter_prefetched(pages, REQUESTS_PER_BATCH)
+    else:
+        page_groups = iter_page_groups(iter_upload_pages(youtube, playlist_id, store.index), REQUESTS_PER_BATCH)
+    new_videos = enrich_upload_pages(youtube, page_groups, on_videos)
+    store.replace(new_videos + store.videos)
+    fresh_ids = {v['id'] for v in new_videos}
+    # An explicit refresh re-checks every chunk; unchanged ones come back as cheap 304s
+    max_age_hours = 0 if refresh else cache_expiry_hours
+    chunk_state, changed, removed = sync_video_chunks(youtube, store, chunk_state, max_age_hours, fresh_ids)
+    # Only new and changed rows are written back
+    if not incremental:
+        db.delete_videos([vid for vid in db.video_ids() if vid not in store])
+    db.upsert_videos({v['id']: v for v in new_videos + changed}.values())
+    db.delete_videos(removed)
+    db.replace_chunks(chunk_state)
+    db.set_meta('syncedAt', time.time())
+    videos = store.videos
+    videos.sort(key=lambda x: x['title'].lower())
+    return videos
+
+# Video list view
+TREE_CHUNK_SIZE = 500  # Rows inserted per UI event-loop turn
+VIRTUAL_LIST_THRESHOLD = 2000  # Above this only a window of rows is materialized
+VIRTUAL_BUFFER_ROWS = 30
+STREAM_REDRAW_SECONDS = 0.5  # Least time between list redraws while videos are still loading
+
+VIDEO_SORT_KEYS = {
+    'Title': lambda v: v['title'].lower(),
+    'Published': lambda v: v.get('publishedAt', ''),
+    'Privacy': lambda v: v.get('status', {}).get('privacyStatus', ''),
+}
+
+def video_row_values(v):
+    return (v['title'], v['id'], v.get('status', {}).get('privacyStatus', ''), v.get('publishedAt', '')[:10])
+
+class VideoListView:
+    # Drives a Treeview whose row iids are video IDs. Small lists are inserted in chunks between UI events;
+    # large lists are virtualized so only the visible rows plus a buffer exist as Treeview items, and the
+    # scrollbar is mapped onto the full list. Selection is tracked by ID so it survives scrolling and filtering.
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.visible_rows = int(tree.cget('height'))
+        self.rows = []
+        self.selected = set()
+        self.materialized = set()
+        self.virtual = False
+        self.window = (0, 0)
+        self.offset = 0
+        self.pending = None
+        self.slide_pending = False
+        self.sort_column = None
+        self.sort_reverse = False
+        self.sort_keys = {}
+        tree.configure(yscrollcommand=self.on_tree_scroll)
+        scrollbar.configure(command=self.on_scrollbar)
+        tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+
+    def set_rows(self, rows):
+        if self.pending:
+            self.tree.after_cancel(self.pending)
+            self.pending = None
+        self.rows = list(rows)
+        if self.sort_column:
+            keys = self.column_keys(self.sort_column)
+            self.rows.sort(key=lambda v: keys[v['id']], reverse=self.sort_reverse)
+        self.selected &= {v['id'] for v in self.rows}
+        self.clear()
+        self.virtual = len(self.rows) > VIRTUAL_LIST_THRESHOLD
+        if self.virtual:
+            self.window = (0, 0)
+            self.render(0)
+        else:
+            self.insert_chunk(0)
+
+    def clear(self):
+        if self.materialized:
+            self.tree.delete(*self.materialized)
+        self.materialized = set()
+
+    def insert_rows(self, rows):
+        for v in rows:
+            self.tree.insert('', 'end', iid=v['id'], values=video_row_values(v))
+            self.materialized.add(v['id'])
+        reselect = [v['id'] for v in rows if v['id'] in self.selected]
+        if reselect:
+            self.tree.selection_add(reselect)
+
+    def insert_chunk(self, start):
+        self.pending = None
+        self.insert_rows(self.rows[start:start + TREE_CHUNK_SIZE])
+        if start + TREE_CHUNK_SIZE < len(self.rows):
+            self.pending = self.tree.after(1, self.insert_chunk, start + TREE_CHUNK_SIZE)
+
+    def render(self, offset):
+        self.slide_pending = False
+        total = len(self.rows)
+        offset = max(0, min(offset, total - self.visible_rows))
+        start = max(0, offset - VIRTUAL_BUFFER_ROWS)
+        end = min(total, offset + self.visible_rows + VIRTUAL_BUFFER_ROWS)
+        if (start, end) != self.window:
+            self.clear()
+            self.insert_rows(self.rows[start:end])
+            self.window = (start, end)
+        self.offset = offset
+        self.tree.yview_moveto((offset - start) / max(1, end - start))
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = max(1, len(self.rows))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+
+    def on_tree_scroll(self, first, last):
+        if not self.virtual:
+            self.scrollbar.set(first, last)
+            return
+        start, end = self.window
+        self.offset = start + round(float(first) * (end - start))
+        self.update_scrollbar()
+        # Slide the window once the view gets close to either edge of the materialized rows
+        near_top = start > 0 and self.offset - start < VIRTUAL_BUFFER_ROWS // 2
+        near_bottom = end < len(self.rows) and end - self.offset - self.visible_rows < VIRTUAL_BUFFER_ROWS // 2
+        if (near_top or near_bottom) and not self.slide_pending:
+            self.slide_pending = True
+            self.tree.after_idle(lambda: self.render(self.offset))
+
+    def on_scrollbar(self, *args):
+        if not self.virtual:
+            self.tree.yview(*args)
+            return
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * len(self.rows))
+        else:
+            step = int(args[1]) * (self.visible_rows if args[2] == 'pages' else 1)
+            offset = self.offset + step
+        self.render(offset)
+
+    def on_select(self, event=None):
+        self.selected = (self.selected - self.materialized) | set(self.tree.selection())
+
+    def selection(self):
+        return [v['id'] for v in self.rows if v['id'] in self.selected]
+
+    def select_all(self):
+        self.selected = {v['id'] for v in self.rows}
+        self.tree.selection_set(list(self.materialized))
+
+    def deselect_all(self):
+        self.selected = set()
+        self.tree.selection_remove(self.tree.selection())
+
+    def column_keys(self, column):
+        if column not in self.sort_keys:
+            key = VIDEO_SORT_KEYS[column]
+            self.sort_keys[column] = {v['id']: key(v) for v in self.rows}
+        keys = self.sort_keys[column]
+        missing = [v for v in self.rows if v['id'] not in keys]
+        if missing:
+            key = VIDEO_SORT_KEYS[column]
+            keys.update((v['id'], key(v)) for v in missing)
+        return keys
+
+    def invalidate_sort_keys(self):
+        self.sort_keys = {}
+
+    def sort_by(self, column):
+        self.sort_reverse = not self.sort_reverse if self.sort_column == column else False
+        self.sort_column = column
+        self.set_rows(self.rows)
+
+# Thumbnails
+THUMBNAIL_MAX_BYTES = 2 * 1024 * 1024
+THUMBNAIL_MIN_WIDTH = 640
+THUMBNAIL_MAX_SIZE = (1280, 720)
+THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+THUMBNAIL_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp'}
+THUMBNAIL_MAP_FILE = 'thumbnails.csv'  # Optional video_id,filename rows inside a thumbnail folder
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it oversized images are rejected instead of shrunk
+    Image = None
+
+def thumbnail_mime_type(data):
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if data.startswith(b'BM'):
+        return 'image/bmp'
+    return None
+
+def jpeg_size(data):
+    # Walks the marker segments up to the first start-of-frame, which holds the dimensions
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1  # Fill byte
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            i += 2  # Markers without a length
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return int.from_bytes(data[i + 7:i + 9], 'big'), int.from_bytes(data[i + 5:i + 7], 'big')
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+def thumbnail_size(data, mime_type):
+    # (width, height) read from the image header, so the size limits hold with or without Pillow
+    if mime_type == 'image/png' and len(data) >= 24:
+        return int.from_bytes(data[16:20], 'big'), int.from_bytes(data[20:24], 'big')
+    if mime_type == 'image/gif' and len(data) >= 10:
+        return int.from_bytes(data[6:8], 'little'), int.from_bytes(data[8:10], 'little')
+    if mime_type == 'image/bmp' and len(data) >= 26:
+        return int.from_bytes(data[18:22], 'little', signed=True), abs(int.from_bytes(data[22:26], 'little', signed=True))
+    if mime_type == 'image/jpeg':
+        return jpeg_size(data)
+    return None
+
+def prepare_thumbnail(data):
+    # Checks an image against YouTube's limits before anything is uploaded, recompressing it to a
+    # 1280x720 JPEG when it is over 2MB (that part needs Pillow)
+    mime_type = thumbnail_mime_type(data)
+    if mime_type is None:
+        raise ValueError("Thumbnail must be a JPEG, PNG, GIF or BMP image")
+    size = thumbnail_size(data, mime_type)
+    if size is None:
+        raise ValueError("Thumbnail dimensions could not be read; the image looks truncated or corrupt")
+    if size[0] < THUMBNAIL_MIN_WIDTH:
+        raise ValueError(f"Thumbnail is {size[0]}x{size[1]}; YouTube needs at least {THUMBNAIL_MIN_WIDTH} pixels wide")
+    if len(data) <= THUMBNAIL_MAX_BYTES:
+        return data, mime_type
+    if Image is None:
+        raise ValueError("Thumbnail is over 2MB (install Pillow to shrink it automatically)")
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail(THUMBNAIL_MAX_SIZE)
+    image = image.convert('RGB')
+    for quality in (90, 80, 70, 60, 50):
+        out = io.BytesIO()
+        image.save(out, 'JPEG', quality=quality, optimize=True)
+        if out.tell() <= THUMBNAIL_MAX_BYTES:
+            return out.getvalue(), 'image/jpeg'
+    raise ValueError("Thumbnail could not be compressed below 2MB")
+
+class ThumbnailCache:
+    # Prepared thumbnails keyed by content hash, so an image shared by many videos is read, checked and
+    # recompressed once. Bounded by bytes because a folder mapping can name thousands of images.
+    def __init__(self, max_bytes=THUMBNAIL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.prepared = OrderedDict()  # sha1 -> (data, mime type), least recently used first
+        self.size = 0
+        self.files = {}  # path -> ((mtime, size), sha1)
+        self.folders = {}  # directory -> (mtime, {video_id: path})
+
+    def get(self, path):
+        stat = os.stat(path)
+        signature = (stat.st_mtime, stat.st_size)
+        with self.lock:
+            known = self.files.get(path)
+            if known and known[0] == signature and known[1] in self.prepared:
+                self.prepared.move_to_end(known[1])
+                return self.prepared[known[1]]
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        with self.lock:
+            self.files[path] = (signature, digest)
+            if digest in self.prepared:
+                self.prepared.move_to_end(digest)
+                return self.prepared[digest]
+        prepared = prepare_thumbnail(data)
+        with self.lock:
+            if digest not in self.prepared:
+                self.prepared[digest] = prepared
+                self.size += len(prepared[0])
+                while self.size > self.max_bytes and len(self.prepared) > 1:
+                    _, (evicted, _) = self.prepared.popitem(last=False)
+                    self.size -= len(evicted)
+        return prepared
+
+    def resolve(self, thumbnail_path, video_id):
+        # A file applies to every video; a folder holds <video_id>.jpg (or .png, ...) files and/or a thumbnails.csv mapping
+        if not os.path.isdir(thumbnail_path):
+            return thumbnail_path
+        return self.folder(thumbnail_path).get(video_id)
+
+    def folder(self, directory):
+        map_path = os.path.join(directory, THUMBNAIL_MAP_FILE)
+        mtime = max(os.path.getmtime(directory), os.path.getmtime(map_path) if os.path.exists(map_path) else 0)
+        with self.lock:
+            cached = self.folders.get(directory)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        mapping = {}
+        for name in os.listdir(directory):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in THUMBNAIL_EXTENSIONS:
+                mapping[stem] = os.path.join(directory, name)
+        if os.path.exists(map_path):
+            with open(map_path, 'r', newline='') as f:
+                for row in csv.reader(f):
+                    if len(row) >= 2 and row[0].strip() and row[0].strip().lower() != 'video_id':
+                        mapping[row[0].strip()] = os.path.join(directory, row[1].strip())
+        with self.lock:
+            self.folders[directory] = (mtime, mapping)
+        return mapping
+
+thumbnail_cache = ThumbnailCache()
+
+def resolve_thumbnail(thumbnail_path, video_id):
+    return thumbnail_cache.resolve(thumbnail_path, video_id) if thumbnail_path else None
+
+def update_request_body(video_id, updates):
+    body = {'id': video_id}
+    if 'snippet' in updates:
+        body['snippet'] = updates['snippet']
+    if 'status' in updates:
+        body['status'] = updates['status']
+    if 'recordingDetails' in updates:
+        body['recordingDetails'] = updates['recordingDetails']
+    return body
+
+def update_video(youtube, video_id, updates):
+    request = youtube.videos().update(
+        part=','.join(updates.keys()),
+        body=update_request_body(video_id, updates)
+    )
+    execute_request(request, 'videos.update')
+
+def set_thumbnail(youtube, video_id, thumbnail_path):
+    from googleapiclient.http import MediaInMemoryUpload
+    data, mime_type = thumbnail_cache.get(thumbnail_path)
+    # Resumable, so a retry after a dropped connection continues the upload instead of restarting it
+    request = youtube.thumbnails().set(
+        videoId=video_id,
+        media_body=MediaInMemoryUpload(data, mimetype=mime_type, resumable=True)
+    )
+    execute_request(request, 'thumbnails.set')
+
+def apply_local_updates(v, updates):
+    if 'snippet' in updates:
+        v['title'] = updates['snippet'].get('title', v['title'])
+        v['description'] = updates['snippet'].get('description', v['description'])
+        v['tags'] = updates['snippet'].get('tags', v['tags'])
+        v['categoryId'] = updates['snippet'].get('categoryId', v['categoryId'])
+        v['defaultLanguage'] = updates['snippet'].get('defaultLanguage', v['defaultLanguage'])
+    if 'status' in updates:
+        v['status'].update(updates['status'])
+    if 'recordingDetails' in updates:
+        v['recordingDate'] = updates['recordingDetails'].get('recordingDate', v.get('recordingDate', ''))
+
+STATUS_MUTABLE_FIELDS = list(VIDEO_STATUS_KEYS)
+
+def skipped_update_units(selected_vids, jobs):
+    # Every selected video used to cost one videos.update; thumbnail-only jobs skip it too
+    sent = sum(1 for _, updates in jobs if updates)
+    return (len(selected_vids) - sent) * API_COSTS['videos.update']
+
+def diff_video_updates(v, updates):
+    # Drops the parts whose values already match the cached video. A part that does change is sent whole,
+    # because videos.update resets any mutable property missing from a part it is given.
+    minimal = {}
+    snippet = updates.get('snippet', {})
+    if any(v.get(key) != value for key, value in snippet.items()):
+        full = {'title': v['title'], 'description': v['description'], 'tags': v['tags'], 'categoryId': v['categoryId']}
+        if v.get('defaultLanguage'):
+            full['defaultLanguage'] = v['defaultLanguage']
+        full.update(snippet)
+        minimal['snippet'] = full
+    status = updates.get('status', {})
+    current = v.get('status', {})
+    if any(current.get(key) != value for key, value in status.items()):
+        full = {key: current[key] for key in STATUS_MUTABLE_FIELDS if key in current}
+        full.update(status)
+        if full.get('privacyStatus') != 'private':
+            full.pop('publishAt', None)  # Only scheduled private videos may carry publishAt
+        minimal['status'] = full
+    recording = updates.get('recordingDetails', {})
+    if recording and recording.get('recordingDate') != v.get('recordingDate'):
+        minimal['recordingDetails'] = recording
+    return minimal
+
+def apply_video_update(youtube, v, updates, thumbnail_path=None, limiter=None, store=None):
+    thumbnail_path = resolve_thumbnail(thumbnail_path, v['id'])
+    if thumbnail_path:
+        thumbnail_cache.get(thumbnail_path)  # A bad image fails here, before any quota is spent
+    if updates:
+        if limiter:
+            limiter.acquire('videos.update')
+        update_video(youtube, v['id'], updates)
+    if thumbnail_path:
+        if limiter:
+            limiter.acquire('thumbnails.set')
+        set_thumbnail(youtube, v['id'], thumbnail_path)
+    apply_local_updates(v, updates)
+    if store is not None and updates:
+        store.save(v)
+
+# Edit transforms
+TITLE_MAX_LENGTH = 100
+DESCRIPTION_MAX_LENGTH = 5000
+
+def parse_tags_text(tags_text):
+    return [t.strip() for t in tags_text.split(',') if t.strip()]
+
+def parse_flag(value):
+    return True if value == "true" else False if value == "false" else None
+
+class CompiledEdit:
+    # Edit parameters (in settings.json form) resolved once per run: patterns compiled, tag lists split and
+    # the description action bound to a method, so applying the edit to each video does no re-parsing
+    def __init__(self, settings):
+        self.settings = dict(settings)
+        self.action = settings.get('action', 'append')
+        self.footer = settings.get('footer', '').strip()
+        self.find = settings.get('find', '').strip()
+        self.replace = settings.get('replace', '').strip()
+        self.keyword = settings.get('keyword', '').strip()
+        self.trim_mode = settings.get('trim_mode', 'none')
+        self.use_regex = bool(settings.get('use_regex', 0))
+        self.title_action = settings.get('title_action', 'none')
+        self.title_text = settings.get('title_text', '').strip()
+        self.tags_action = settings.get('tags_action', 'none')
+        self.tag_list = parse_tags_text(settings.get('tags_text', ''))
+        self.tag_set = set(self.tag_list)
+        self.category = next((k for k, v in CATEGORIES.items() if v == settings.get('category')), None)
+        self.privacy = settings.get('privacy') if settings.get('privacy', 'no_change') != 'no_change' else None
+        self.license = settings.get('license') if settings.get('license', 'no_change') != 'no_change' else None
+        self.embeddable = parse_flag(settings.get('embeddable'))
+        self.public_stats = parse_flag(settings.get('public_stats'))
+        self.made_for_kids = parse_flag(settings.get('made_for_kids'))
+        self.thumbnail_path = settings.get('thumbnail_path') or None
+        if self.thumbnail_path:
+            if not os.path.exists(self.thumbnail_path):
+                raise ValueError(f"Thumbnail not found: {self.thumbnail_path}")
+            if not os.path.isdir(self.thumbnail_path):
+                thumbnail_cache.get(self.thumbnail_path)  # Checked and prepared once per run
+        self.language = settings.get('language') if settings.get('language', '') not in ('', 'No Change') else None
+        self.recording_date = settings.get('recording_date') if settings.get('recording_date', '') not in ('', 'No Change') else None
+        if self.recording_date:
+            try:
+                datetime.fromisoformat(self.recording_date.replace('Z', '+00:00'))
+            except ValueError:
+                raise ValueError("Invalid recording date format (use ISO 8601)")
+        self.pattern = None
+        if self.use_regex and self.action in ["find_replace", "trim", "replace_after"]:
+            try:
+                self.pattern = re.compile(self.find if self.action == "find_replace" else self.keyword, re.IGNORECASE)
+            except re.error:
+                raise ValueError("Invalid regex pattern")
+        self.desc_func = {
+            'append': self._append,
+            'prepend': self._prepend,
+            'replace_all': self._replace_all,
+            'find_replace': self._find_replace,
+            'trim': self._trim,
+            'replace_after': self._replace_after,
+        }.get(self.action, self._unchanged)
+
+    def _unchanged(self, desc):
+        return desc, False
+
+    def _append(self, desc):
+        return desc + "\n\n" + self.footer, True
+
+    def _prepend(self, desc):
+        return self.footer + "\n\n" + desc, True
+
+    def _replace_all(self, desc):
+        return self.footer, True
+
+    def _find_replace(self, desc):
+        if not self.find:
+            return desc, False
+        if self.pattern:
+            new_desc = self.pattern.sub(self.replace, desc)
+        else:
+            new_desc = desc.replace(self.find, self.replace)
+        return new_desc, new_desc != desc
+
+    def _trim(self, desc):
+        if not self.keyword or self.trim_mode == "none":
+            return desc, False
+        if self.pattern:
+            match = self.pattern.search(desc)
+            if not match:
+                return desc, False
+            start, end = match.start(), match.end()
+        else:
+            start = desc.find(self.keyword)
+            if start < 0:
+                return desc, False
+            end = start + len(self.keyword)
+        if self.trim_mode == "before":
+            return desc[start:], True
+        if self.trim_mode == "after":
+            return desc[:end], True
+        return desc, True
+
+    def _replace_after(self, desc):
+        if not self.keyword:
+            return desc, False
+        if self.pattern:
+            match = self.pattern.search(desc)
+            end = match.end() if match else -1
+        else:
+            start = desc.find(self.keyword)
+            end = start + len(self.keyword) if start >= 0 else -1
+        if end < 0:
+            return desc, False
+        return desc[:end] + self.footer, True
+
+    def new_desc(self, desc):
+        new_desc, changed = self.desc_func(desc)
+        if len(new_desc) > DESCRIPTION_MAX_LENGTH:
+            new_desc = new_desc[:DESCRIPTION_MAX_LENGTH]  # Truncate to API limit
+            changed = True
+        return new_desc, changed
+
+    def new_title(self, title):
+        new_title = title
+        changed = False
+        if self.title_action == "append":
+            new_title = title + " " + self.title_text
+            changed = True
+        elif self.title_action == "prepend":
+            new_title = self.title_text + " " + title
+            changed = True
+        elif self.title_action == "replace":
+            new_title = self.title_text
+            changed = True
+        if len(new_title) > TITLE_MAX_LENGTH:
+            new_title = new_title[:TITLE_MAX_LENGTH]
+            changed = True
+        return new_title, changed
+
+    def new_tags(self, tags):
+        new_tags = tags[:]
+        changed = False
+        if self.tags_action == "add":
+            new_tags.extend(self.tag_list)
+            changed = True
+        elif self.tags_action == "replace":
+            new_tags = self.tag_list[:]
+            changed = True
+        elif self.tags_action == "remove":
+            new_tags = [t for t in new_tags if t not in self.tag_set]
+            changed = True
+        return optimize_tags(new_tags), changed
+
+    def updates_for(self, v):
+        updates = {}
+        snippet = {}
+        status = {}
+        if self.title_action != "none":
+            snippet['title'] = self.new_title(v['title'])[0]
+        if self.tags_action != "none":
+            snippet['tags'] = self.new_tags(v['tags'])[0]
+        snippet['description'] = self.new_desc(v['description'])[0]
+        if self.category:
+            snippet['categoryId'] = self.category
+        if self.language:
+            snippet['defaultLanguage'] = self.language
+        updates['snippet'] = snippet
+        if self.privacy:
+            status['privacyStatus'] = self.privacy
+        if self.license:
+            status['license'] = self.license
+        if self.embeddable is not None:
+            status['embeddable'] = self.embeddable
+        if self.public_stats is not None:
+            status['publicStatsViewable'] = self.public_stats
+        if self.made_for_kids is not None:
+            status['selfDeclaredMadeForKids'] = self.made_for_kids
+        if status:
+            updates['status'] = status
+        if self.recording_date:
+            updates['recordingDetails'] = {'recordingDate': self.recording_date}
+        return updates
+
+    def thumbnail_for(self, v):
+        return resolve_thumbnail(self.thumbnail_path, v['id'])
+
+    def thumbnail_map(self, jobs):
+        thumbnails = {}
+        for v, _ in jobs:
+            path = self.thumbnail_for(v)
+            if path:
+                thumbnails[v['id']] = path
+        return thumbnails
+
+    def minimal_updates(self, v, base=None):
+        # base is the server state of a video with unsent local edits (a CSV import); those edits are sent along
+        updates = self.updates_for(v)
+        if base is None:
+            return diff_video_updates(v, updates)
+        snippet = updates.setdefault('snippet', {})
+        for key in ('title', 'description', 'tags', 'categoryId'):
+            snippet.setdefault(key, v[key])
+        if v['status'].get('privacyStatus'):
+            updates.setdefault('status', {}).setdefault('privacyStatus', v['status']['privacyStatus'])
+        return diff_video_updates(base, updates)
+
+    def build_jobs(self, videos, pending=None):
+        # One pass over the selection: (video, minimal updates) for every video with something to do.
+        # pending maps video IDs with unsent local edits to their server state.
+        jobs = []
+        pending = pending or {}
+        for v in videos:
+            updates = self.minimal_updates(v, pending.get(v['id']))
+            if updates or self.thumbnail_for(v):
+                jobs.append((v, updates))
+        return jobs
+
+def compute_new_desc(desc, action, footer, find, replace, keyword, trim_m, use_regex):
+    # Inputs are used verbatim and a bad pattern raises re.error, as before CompiledEdit existed
+    edit = CompiledEdit({'action': action, 'trim_mode': trim_m})
+    edit.footer, edit.find, edit.replace, edit.keyword = footer, find, replace, keyword
+    pattern = find if action == "find_replace" else keyword
+    if use_regex and pattern and (action in ["find_replace", "replace_after"] or (action == "trim" and trim_m != "none")):
+        edit.pattern = re.compile(pattern, re.IGNORECASE)
+    return edit.new_desc(desc)
+
+def compute_new_title(title, title_action, title_text):
+    edit = CompiledEdit({'title_action': title_action})
+    edit.title_text = title_text
+    return edit.new_title(title)
+
+def compute_new_tags(tags, tags_action, tags_text):
+    return CompiledEdit({'tags_action': tags_action, 'tags_text': tags_text}).new_tags(tags)
+
+def optimize_tags(tags):
+    unique_tags = list(set(tags))  # Remove duplicates
+    unique_tags.sort()  # Sort alphabetically
+    return unique_tags[:30]  # Limit to reasonable number
+
+# Preview
+PREVIEW_PAGE_SIZE = 100  # Selected videos per preview page
+PREVIEW_DIFF_LINES = 30  # Description diff lines shown per video
+
+def description_diff(old, new, limit=PREVIEW_DIFF_LINES):
+    lines = list(difflib.unified_diff(old.splitlines(), new.splitlines(), lineterm='', n=1))[2:]  # Drop the ---/+++ header
+    if len(lines) > limit:
+        lines = lines[:limit] + [f"... {len(lines) - limit} more lines"]
+    return lines
+
+def preview_entry(edit, v, base=None):
+    # Only the fields the edit would change, with the description as a compact line diff; None if nothing changes
+    updates = edit.minimal_updates(v, base)
+    thumbnail_path = edit.thumbnail_for(v)
+    if not updates and not thumbnail_path:
+        return None
+    lines = [f"{v['title']} ({v['id']}):"]
+    v = base or v  # Changes are shown against the server state
+    snippet = updates.get('snippet', {})
+    if snippet.get('title', v['title']) != v['title']:
+        lines.append(f"  Title: {v['title']} -> {snippet['title']}")
+    if snippet.get('tags', v['tags']) != v['tags']:
+        added = [f"+{tag}" for tag in snippet['tags'] if tag not in v['tags']]
+        removed = [f"-{tag}" for tag in v['tags'] if tag not in snippet['tags']]
+        lines.append(f"  Tags: {', '.join(added + removed) or 'reordered'}")
+    if snippet.get('categoryId', v['categoryId']) != v['categoryId']:
+        lines.append(f"  Category: {CATEGORIES.get(v['categoryId'], v['categoryId'])} -> {CATEGORIES.get(snippet['categoryId'])}")
+    if snippet.get('defaultLanguage', v.get('defaultLanguage')) != v.get('defaultLanguage'):
+        lines.append(f"  Default language: {v.get('defaultLanguage') or 'none'} -> {snippet['defaultLanguage']}")
+    if snippet.get('description', v['description']) != v['description']:
+        lines.append("  Description:")
+        lines.extend(f"    {line}" for line in description_diff(v['description'], snippet['description']))
+    current = v.get('status', {})
+    for key, value in updates.get('status', {}).items():
+        if current.get(key) != value:
+            lines.append(f"  {key}: {current.get(key)} -> {value}")
+    if 'recordingDetails' in updates:
+        lines.append(f"  Recording date: {v.get('recordingDate') or 'none'} -> {updates['recordingDetails']['recordingDate']}")
+    if thumbnail_path:
+        lines.append(f"  Thumbnail: {thumbnail_path}")
+    return '\n'.join(lines) + '\n\n'
+
+def preview_summary(edit, selected_vids, pending=None):
+    changed = thumbnails = 0
+    pending = pending or {}
+    for v in selected_vids:
+        if edit.minimal_updates(v, pending.get(v['id'])):
+            changed += 1
+        if edit.thumbnail_for(v):
+            thumbnails += 1
+    units = changed * API_COSTS['videos.update'] + thumbnails * API_COSTS['thumbnails.set']
+    return f"{changed} of {len(selected_vids)} selected videos would change, {thumbnails} thumbnails; estimated quota use: {units} units\n\n"
+
+def iter_preview(edit, selected_vids, pending=None):
+    pending = pending or {}
+    for v in selected_vids:
+        entry = preview_entry(edit, v, pending.get(v['id']))
+        if entry:
+            yield entry
+
+# Backup and restore
+BACKUP_DIR = 'backups'
+LEGACY_BACKUP_FILE = 'backup.json'
+BACKUP_FORMAT_VERSION = 1
+BACKUP_SEGMENT_OBJECTS = 200  # Videos per gzip member of the pack; restore decompresses only the members it needs
+
+def backup_record(item):
+    return {
+        'id': item['id'],
+        'snippet': item['snippet'],
+        'status': item['status'],
+        'recordingDetails': item.get('recordingDetails', {})
+    }
+
+def backup_record_hash(record):
+    return hashlib.sha1(json.dumps(record, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+class BackupStore:
+    # Each snapshot is a small gzip'd JSONL manifest of (video ID, content hash) written as batches arrive.
+    # Video contents live once in an append-only gzip'd pack shared by all snapshots, so a video that has
+    # not changed since an earlier snapshot costs one manifest line. Chunks whose ETag still matches the
+    # previous snapshot come back as 304s and reuse its hashes without being downloaded again. The pack is
+    # a series of gzip members of up to BACKUP_SEGMENT_OBJECTS videos, and the index maps each hash to the
+    # byte offset of its member, so restore seeks to the members it needs instead of reading the history.
+    def __init__(self, directory=BACKUP_DIR):
+        self.directory = directory
+        self.objects_path = os.path.join(directory, 'objects.jsonl.gz')
+        self.index_path = os.path.join(directory, 'objects.idx')
+        self.state_path = os.path.join(directory, 'state.json')
+
+    def snapshots(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.startswith('snapshot-') and name.endswith('.jsonl.gz'))
+
+    def latest(self):
+        snapshots = self.snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def read_manifest(self, snapshot):
+        manifest = {}
+        with gzip.open(snapshot, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if 'id' in entry:
+                    manifest[entry['id']] = entry['hash']
+        return manifest
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {'packSize': 0, 'snapshot': None, 'chunks': {}}
+        with open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def load_hashes(self):
+        if not os.path.exists(self.index_path):
+            return set()
+        with open(self.index_path, 'r') as f:
+            return set(line.split()[0] for line in f if line.strip())
+
+    def load_offsets(self, digests):
+        # Pack offset of each wanted hash; index lines written before segments have none and map to 0
+        offsets = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if parts and parts[0] in digests:
+                        offsets[parts[0]] = int(parts[1]) if len(parts) > 1 else 0
+        return offsets
+
+    def append_segment(self, pack, lines, digests, new_hashes):
+        if lines:
+            offset = pack.tell()
+            pack.write(gzip.compress(''.join(lines).encode('utf-8')))
+            new_hashes.extend((digest, offset) for digest in digests)
+            lines.clear()
+            digests.clear()
+
+    def write_snapshot(self, youtube, video_ids, token=None, full=False):
+        # full=True keeps every field of the snippet, status and recordingDetails parts, not just the
+        # ones restore writes back
+        os.makedirs(self.directory, exist_ok=True)
+        state = self.load_state()
+        # Drop whatever an interrupted snapshot appended to the pack after the last commit
+        if os.path.exists(self.objects_path) and os.path.getsize(self.objects_path) > state['packSize']:
+            with open(self.objects_path, 'r+b') as f:
+                f.truncate(state['packSize'])
+        known = self.load_hashes()
+        latest = self.latest()
+        previous = self.read_manifest(latest) if latest else {}
+        chunk_etags = {}
+        # ETags of full and field-masked responses never match each other
+        if latest and state.get('snapshot') == os.path.basename(latest) and state.get('full', True) == full:
+            chunk_etags = state['chunks']
+
+        chunks = [video_ids[i:i + VIDEOS_PER_REQUEST] for i in range(0, len(video_ids), VIDEOS_PER_REQUEST)]
+        etags = {}
+        for chunk in chunks:
+            key = video_chunk_key(chunk)
+            if key in chunk_etags and all(vid in previous for vid in chunk):
+                etags[key] = chunk_etags[key]
+
+        created = datetime.now(timezone.utc)
+        path = os.path.join(self.directory, created.strftime('snapshot-%Y%m%d-%H%M%S.jsonl.gz'))
+        new_chunks = {}
+        new_hashes = []  # (hash, pack offset) of the objects written by this snapshot
+        segment_lines = []
+        segment_hashes = []
+        count = 0
+        try:
+            with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as manifest, open(self.objects_path, 'ab') as pack:
+                manifest.write(json.dumps({'version': BACKUP_FORMAT_VERSION, 'createdAt': created.isoformat()}) + '\n')
+                for results in iter_video_chunks(youtube, chunks, etags=etags, fields=None if full else VIDEO_FIELDS):
+                    if token is not None:
+                        token.check()
+                    for chunk, response in results:
+                        key = video_chunk_key(chunk)
+                        if response is None:  # Unchanged since the previous snapshot
+                            new_chunks[key] = etags[key]
+                            entries = [(vid, previous[vid]) for vid in chunk]
+                        else:
+                            if response.get('etag'):
+                                new_chunks[key] = response['etag']
+                            entries = []
+                            for item in response.get('items', []):
+                                record = backup_record(item)
+                                digest = backup_record_hash(record)
+                                if digest not in known:
+                                    known.add(digest)
+                                    segment_lines.append(json.dumps({'hash': digest, 'item': record}) + '\n')
+                                    segment_hashes.append(digest)
+                                    if len(segment_lines) >= BACKUP_SEGMENT_OBJECTS:
+                                        self.append_segment(pack, segment_lines, segment_hashes, new_hashes)
+                                entries.append((item['id'], digest))
+                        for vid, digest in entries:
+                            manifest.write(json.dumps({'id': vid, 'hash': digest}) + '\n')
+                        count += len(entries)
+                self.append_segment(pack, segment_lines, segment_hashes, new_hashes)
+        except BaseException:
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')  # The pack tail is dropped on the next run
+            raise
+
+        # Commit order matters: an index entry must never point past the committed end of the pack
+        self.save_state({'packSize': os.path.getsize(self.objects_path), 'snapshot': os.path.basename(path), 'chunks': new_chunks,
+                         'full': full})
+        with open(self.index_path, 'a') as f:
+            f.write(''.join(f"{digest} {offset}\n" for digest, offset in new_hashes))
+        os.replace(path + '.tmp', path)
+        return path, count, len(new_hashes)
+
+    def iter_items(self, snapshot=None, video_ids=None):
+        snapshot = snapshot or self.latest()
+        wanted = {digest: vid for vid, digest in self.read_manifest(snapshot).items()
+                  if video_ids is None or vid in video_ids}
+        if not wanted:
+            return
+        offsets = self.load_offsets(wanted)
+        segments = {}
+        for digest in wanted:
+            segments.setdefault(offsets.get(digest, 0), set()).add(digest)
+        with open(self.objects_path, 'rb') as raw:
+            for offset in sorted(segments):
+                remaining = segments[offset]
+                raw.seek(offset)
+                try:
+                    with gzip.GzipFile(fileobj=raw) as pack:
+                        for line in pack:
+                            entry = json.loads(line)
+                            if entry['hash'] in remaining:
+                                remaining.discard(entry['hash'])
+                                yield entry['item']
+                                if not remaining:
+                                    break
+                except EOFError:
+                    pass  # Uncommitted tail of an interrupted snapshot
+
+def backup_videos(youtube, videos, directory=BACKUP_DIR, token=None, full=False):
+    # Chunked in upload order, as sync is, so a bulk title edit does not reshuffle every chunk and miss every ETag
+    video_ids = [v['id'] for v in sorted(videos, key=lambda v: (v.get('publishedAt', ''), v['id']))]
+    return BackupStore(directory).write_snapshot(youtube, video_ids, token, full)
+
+def latest_backup(directory=BACKUP_DIR):
+    return BackupStore(directory).latest() or (LEGACY_BACKUP_FILE if os.path.exists(LEGACY_BACKUP_FILE) else None)
+
+def iter_backup(path=None, video_ids=None):
+    # Streams the videos of a snapshot (the newest by default) or of a legacy backup.json
+    path = path or latest_backup()
+    if path.endswith('.json'):
+        with open(path, 'r') as f:
+            for item in json.load(f):
+                if video_ids is None or item['id'] in video_ids:
+                    yield item
+        return
+    yield from BackupStore(os.path.dirname(path) or '.').iter_items(path, video_ids)
+
+RESTORE_SCAN_SIZE = VIDEOS_PER_REQUEST * REQUESTS_PER_BATCH  # Backup entries compared per round trip
+
+def backup_item_updates(item):
+    snippet = item['snippet']
+    updates = {'snippet': {key: snippet[key] for key in ('title', 'description', 'categoryId', 'defaultLanguage') if key in snippet}}
+    updates['snippet']['tags'] = snippet.get('tags', [])
+    status = {key: item['status'][key] for key in STATUS_MUTABLE_FIELDS if key in item['status']}
+    if status:
+        updates['status'] = status
+    recording_date = (item.get('recordingDetails') or {}).get('recordingDate')
+    if recording_date:
+        updates['recordingDetails'] = {'recordingDate': recording_date}
+    return updates
+
+def plan_restore(youtube, store, items, live=True, token=None):
+    # Compares streamed backup entries with each video's current state and returns (v, minimal updates)
+    # only for those that differ. With live=True the current state is refetched first (1 unit per 50 videos)
+    # so a stale cache cannot hide a change.
+    jobs = []
+    missing = []
+    unchanged = 0
+    items = iter(items)
+    while True:
+        group = list(itertools.islice(items, RESTORE_SCAN_SIZE))
+        if not group:
+            break
+        if token is not None:
+            token.check()
+        if live:
+            current = {}
+            for found in iter_video_batches(youtube, [item['id'] for item in group]):
+                current.update(found)
+            refreshed = []
+            for vid, found in current.items():
+                v = store.get(vid)
+                if v is not None:
+                    merge_video_item(v, found)
+                    refreshed.append(v)
+            store.save(*refreshed)
+        for item in group:
+            v = store.get(item['id'])
+            if v is None or (live and item['id'] not in current):
+                missing.append(item['id'])
+                continue
+            updates = diff_video_updates(v, backup_item_updates(item))
+            if updates:
+                jobs.append((v, updates))
+            else:
+                unchanged += 1
+    return jobs, unchanged, missing
+
+# Update journal
+JOURNAL_FILE = 'update_journal.jsonl'
+JOURNAL_FSYNC_EVERY = 20  # Records between fsyncs
+JOURNAL_FSYNC_SECONDS = 1.0
+journal_lock = threading.Lock()
+open_journals = {}  # Path -> UpdateJournal instances writing to it in this process
+
+class UpdateJournal:
+    # Append-only JSON lines. Each run starts with a 'start' record holding its settings and selection and a
+    # 'planned' record with the exact updates for each video, synced before anything is sent; every video then
+    # gets an 'intent' record before it is sent and a 'done' or 'error' record after. fsync of those is batched,
+    # so a crash can lose a 'done'. Resume replays the planned updates rather than recomputing them from the
+    # edit, so a video sent twice gets the same absolute values again instead of having the edit applied twice.
+    # Opening the journal drops what finished runs no longer need, so it stays about the size of the open runs.
+    def __init__(self, path=JOURNAL_FILE, fsync_every=JOURNAL_FSYNC_EVERY, fsync_seconds=JOURNAL_FSYNC_SECONDS):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+        self.lock = threading.Lock()
+        with journal_lock:
+            if not open_journals.get(path):
+                self.compact(path)  # Rewriting under another writer would cut its records off
+            open_journals[path] = open_journals.get(path, 0) + 1
+            self.file = open(path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def record(self, run_id, state, video_id=None, sync=False, **fields):
+        entry = {'run': run_id, 'state': state, 'time': time.time()}
+        if video_id is not None:
+            entry['id'] = video_id
+        entry.update(fields)
+        with self.lock:
+            self.file.write(json.dumps(entry) + '\n')
+            self.unsynced += 1
+            if sync or self.unsynced >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_seconds:
+                self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def start_run(self, settings, video_ids, jobs, thumbnails, plan=None, queue=False):
+        # plan, for a replayed dry-run plan, is its {'path', 'sha1'} so later runs of the same file skip what this one did.
+        # queue marks a scheduler round, which the job queue finishes itself; resume leaves those alone.
+        run_id = (datetime.now().strftime('%Y%m%d-%H%M%S-') + hashlib.sha1(json.dumps([settings, video_ids]).encode()).hexdigest()[:8] +
+                  '-' + os.urandom(3).hex())  # Unique even when the same edit is started twice within a second
+        fields = {'plan': plan} if plan else {}
+        if queue:
+            fields['queue'] = True
+        self.record(run_id, 'start', settings=settings, ids=list(video_ids), planned=len(jobs), **fields)
+        for v, updates in jobs:
+            self.record(run_id, 'planned', v['id'], updates=updates, thumbnail=thumbnails.get(v['id']))
+        with self.lock:
+            self._sync()
+        return run_id
+
+    def finish_run(self, run_id):
+        self.record(run_id, 'finish', sync=True)
+
+    def close(self):
+        with self.lock:
+            self._sync()
+            self.file.close()
+        with journal_lock:
+            open_journals[self.path] -= 1
+
+    @staticmethod
+    def compact(path):
+        # Rewrites the journal without finished runs. Of a finished plan run whose plan file still exists,
+        # the start, done and finish records stay, so plan_done can still skip what it sent.
+        if not os.path.exists(path):
+            return
+        finished = set()
+        plan_runs = set()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry['state'] == 'finish':
+                    finished.add(entry['run'])
+                elif entry['state'] == 'start' and entry.get('plan') and os.path.exists(entry['plan']['path']):
+                    plan_runs.add(entry['run'])
+        if not finished:
+            return
+        tmp_path = path + '.tmp'
+        with open(path, 'r', encoding='utf-8') as f, open(tmp_path, 'w', encoding='utf-8') as out:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from a crash
+                run = entry['run']
+                if run not in finished or (run in plan_runs and entry['state'] in ('start', 'done', 'finish')):
+                    out.write(line)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def find_run(path=JOURNAL_FILE, run_id=None):
+        # The given run, or the most recent one that never finished, with its planned updates and the set of
+        # videos already done
+        if not os.path.exists(path):
+            return None
+        runs = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from a crash
+                run = runs.setdefault(entry['run'], {'run_id': entry['run'], 'done': set(), 'finished': False})
+                if entry['state'] == 'start':
+                    run['settings'] = entry['settings']
+                    run['ids'] = entry['ids']
+                    run['planned'] = {}
+                    run['queue'] = entry.get('queue', False)
+                elif entry['state'] == 'planned':
+                    run['planned'][entry['id']] = entry
+                elif entry['state'] == 'done':
+                    run['done'].add(entry['id'])
+                elif entry['state'] == 'finish':
+                    run['finished'] = True
+                    run['planned'] = {}  # Never replayed; no need to hold the bodies of every past run
+        if run_id is not None:
+            run = runs.get(run_id)
+            return run if run and 'settings' in run else None
+        for run in reversed(list(runs.values())):
+            if 'settings' in run and not run['finished'] and not run['queue']:
+                return run
+        return None
+
+    @staticmethod
+    def plan_done(path, plan_sha1):
+        # IDs of the videos any earlier run of the plan file with this SHA-1 already updated
+        if not os.path.exists(path):
+            return set()
+        plan_runs = set()
+        done = set()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry['state'] == 'start' and (entry.get('plan') or {}).get('sha1') == plan_sha1:
+                    plan_runs.add(entry['run'])
+                elif entry['state'] == 'done' and entry['run'] in plan_runs:
+                    done.add(entry['id'])
+        return done
+
+def journaled_jobs(run, store):
+    # The videos of a journaled run that are not done yet, with the updates and thumbnails it planned for them
+    jobs = []
+    thumbnails = {}
+    for video_id, entry in run['planned'].items():
+        v = store.get(video_id)
+        if video_id in run['done'] or v is None:
+            continue
+        jobs.append((v, entry['updates']))
+        if entry.get('thumbnail'):
+            thumbnails[video_id] = entry['thumbnail']
+    return jobs, thumbnails
 
-def save_quota():
-    with open(QUOTA_FILE, 'w') as f:
-        json.dump({'date': last_quota_date.strftime('%Y-%m-%d'), 'units': estimated_units}, f)
+def run_journaled_updates(engine, journal, run_id, jobs, thumbnails, store, progress_callback=None, result_callback=None, token=None):
+    # thumbnails maps video IDs to the thumbnail file each one gets
+    def work(youtube, job):
+        v, updates = job
+        journal.record(run_id, 'intent', v['id'])
+        try:
+            apply_video_update(youtube, v, updates, thumbnails.get(v['id']), engine.limiter, store)
+        except Exception as e:
+            journal.record(run_id, 'error', v['id'], error=str(e))
+            raise
+        journal.record(run_id, 'done', v['id'])
 
-def add_quota_usage(method, cost_multiplier=1):
-    global estimated_units
-    cost = API_COSTS.get(method, 0) * cost_multiplier
-    estimated_units += cost
-    save_quota()
-    return cost
+    results = engine.run(jobs, work, progress_callback, result_callback, token)
+    if not any(error for _, _, error in results):
+        journal.finish_run(run_id)  # A cancelled run, or one with failed videos, stays open so Resume can retry them
+    return results
 
-def get_remaining_quota():
-    return DAILY_QUOTA_LIMIT - estimated_units
+# Dry-run plans
+PLAN_FILE = 'dry_run.json'
+PLAN_FORMAT_VERSION = 1
+PLAN_CALL_SECONDS = 0.5  # Assumed latency of a write call until this process has timed some
 
-def get_authenticated_service(token_file='token.pickle'):
-    creds = None
-    if os.path.exists(token_file):
-        with open(token_file, 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-        creds = flow.run_local_server(port=0)
-        with open(token_file, 'wb') as token:
-            pickle.dump(creds, token)
-    return build('youtube', 'v3', credentials=creds)
+def video_fingerprint(v):
+    # Hash of everything a plan's request bodies were computed from, to catch videos edited after planning
+    state = [v['title'], v['description'], v['tags'], v['categoryId'], v['defaultLanguage'], dict(v.get('status') or {}),
+             v.get('recordingDate', '')]
+    return hashlib.sha1(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()
 
-def get_current_channel(youtube):
+def estimate_run_seconds(requests, units, workers=MAX_WORKERS):
+    # Whichever is slowest: the request rate limit, the quota rate limit, or call latency spread over the workers
+    latency = api_metrics.mean_seconds('videos.update') or PLAN_CALL_SECONDS
+    return max(requests / REQUESTS_PER_SECOND, units / QUOTA_UNITS_PER_SECOND, requests * latency / workers)
+
+def build_plan(edit, selected_vids, pending=None):
+    # The exact videos.update bodies and thumbnail uploads an edit would send, computed once so they can be
+    # reviewed and later replayed by apply_plan_jobs without running the transforms again
+    entries = []
+    pending = pending or {}
+    for v in selected_vids:
+        updates = edit.minimal_updates(v, pending.get(v['id']))
+        thumbnail_path = edit.thumbnail_for(v)
+        if not updates and not thumbnail_path:
+            continue
+        entry = {'id': v['id'], 'title': v['title'], 'fingerprint': video_fingerprint(v), 'cost': job_item_cost(updates, thumbnail_path)}
+        if updates:
+            entry['update'] = {'part': ','.join(updates), 'body': update_request_body(v['id'], updates)}
+        if thumbnail_path:
+            data, mime_type = thumbnail_cache.get(thumbnail_path)
+            entry['thumbnail'] = {'path': os.path.abspath(thumbnail_path), 'mimeType': mime_type, 'bytes': len(data),
+                                  'sha1': hashlib.sha1(data).hexdigest()}
+        entries.append(entry)
+    units = sum(entry['cost'] for entry in entries)
+    requests = sum(('update' in entry) + ('thumbnail' in entry) for entry in entries)
+    return {
+        'version': PLAN_FORMAT_VERSION,
+        'createdAt': datetime.now(timezone.utc).isoformat(),
+        'settings': edit.settings,
+        'selected': len(selected_vids),
+        'quota': {'units': units, 'remainingToday': quota_ledger.remaining()},
+        'estimatedSeconds': round(estimate_run_seconds(requests, units), 1),
+        'videos': entries,
+    }
+
+def plan_summary(plan):
+    # Quota left is read now, not from the plan, since a saved plan can be applied hours or days later
+    thumbnails = sum(1 for entry in plan['videos'] if 'thumbnail' in entry)
+    units = plan['quota']['units']
+    remaining = quota_ledger.remaining()
+    text = (f"{len(plan['videos'])} of {plan['selected']} selected videos will change, {thumbnails} thumbnails; "
+            f"{units} quota units ({remaining} left today), about {timedelta(seconds=round(plan['estimatedSeconds']))}")
+    if units > remaining:
+        text += "; the daily quota runs out before the end, so finish it with resume after the reset"
+    return text + "\n"
+
+def save_plan(plan, path=PLAN_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(plan, f, indent=2)
+    os.replace(tmp_path, path)
+
+def load_plan(path=PLAN_FILE):
+    # The plan, plus a 'source' reference to the exact file (path and SHA-1) for the journal
+    with open(path, 'rb') as f:
+        data = f.read()
     try:
-        request = youtube.channels().list(
-            part="snippet",
-            mine=True
-        )
-        response = request.execute()
-        add_quota_usage('channels.list')
-        return response['items'][0]['snippet']['title']
-    except Exception as e:
-        return "Unknown (Error: " + str(e) + ")"
+        plan = json.loads(data)
+    except ValueError:
+        plan = None
+    if not isinstance(plan, dict) or plan.get('version') != PLAN_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a dry-run plan (write one with Dry Run or the plan command)")
+    plan['source'] = {'path': os.path.abspath(path), 'sha1': hashlib.sha1(data).hexdigest()}
+    return plan
 
-def get_uploads_playlist_id(youtube, cache_file='playlist_id_cache.json'):
-    if os.path.exists(cache_file):
-        with open(cache_file, 'r') as f:
-            data = json.load(f)
-        return data['playlist_id']
-    request = youtube.channels().list(
-        part="contentDetails",
-        mine=True
-    )
-    response = request.execute()
-    add_quota_usage('channels.list')
-    playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-    with open(cache_file, 'w') as f:
-        json.dump({'playlist_id': playlist_id}, f)
-    return playlist_id
+def apply_plan_jobs(plan, store, done=frozenset()):
+    # Turns a plan back into (video, updates) jobs plus a thumbnail map. Videos that an earlier run of the
+    # plan already updated (done) are left out as applied. Videos that changed since the plan was made, or
+    # whose thumbnail file did, are left out as stale; re-plan them instead of overwriting.
+    jobs = []
+    thumbnails = {}
+    stale = []
+    missing = []
+    applied = []
+    for entry in plan['videos']:
+        if entry['id'] in done:
+            applied.append(entry['id'])
+            continue
+        v = store.get(entry['id'])
+        if v is None:
+            missing.append(entry['id'])
+            continue
+        if video_fingerprint(v) != entry['fingerprint']:
+            stale.append(entry['id'])
+            continue
+        thumbnail = entry.get('thumbnail')
+        if thumbnail:
+            try:
+                data, _ = thumbnail_cache.get(thumbnail['path'])
+            except (OSError, ValueError):
+                data = None
+            if data is None or hashlib.sha1(data).hexdigest() != thumbnail['sha1']:
+                stale.append(entry['id'])
+                continue
+            thumbnails[v['id']] = thumbnail['path']
+        updates = {}
+        if 'update' in entry:
+            body = entry['update']['body']
+            updates = {part: body[part] for part in entry['update']['part'].split(',')}
+        jobs.append((v, updates))
+    return jobs, thumbnails, stale, missing, applied
 
-def get_all_videos(youtube, cache_file='videos_cache.json', cache_expiry_hours=24):
-    if os.path.exists(cache_file) and (time.time() - os.path.getmtime(cache_file) < cache_expiry_hours * 3600):
-        with open(cache_file, 'r') as f:
-            videos = json.load(f)
-        return videos
-    playlist_id = get_uploads_playlist_id(youtube)
-    videos = []
-    next_page_token = None
-    while True:
-        try:
-            request = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-            response = request.execute()
-            add_quota_usage('playlistItems.list')
-            for item in response['items']:
-                vid = item['snippet']['resourceId']['videoId']
-                snippet = item['snippet']
-                videos.append({
-                    'id': vid,
-                    'title': snippet['title'],
-                    'description': snippet['description'],
-                    'tags': snippet.get('tags', []),
-                    'categoryId': snippet.get('categoryId', '22'),
-                    'defaultLanguage': snippet.get('defaultLanguage', ''),
-                    'publishedAt': snippet.get('publishedAt', ''),
-                    'lastUpdated': None,  # To be set when updated
-                })
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
+# Multi-day job queue
+JOB_PRIORITIES = ['newest', 'oldest', 'most_viewed', 'selection']
+JOB_MAX_ATTEMPTS = 3
+JOB_DISPATCH_SIZE = 200  # Items handed to the update engine per round
+QUOTA_RESET_MARGIN_SECONDS = 60
+
+JOB_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    created_at REAL NOT NULL,
+    priority_rule TEXT,
+    thumbnail_path TEXT
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    video_id TEXT NOT NULL,
+    priority REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    updates_json TEXT NOT NULL,
+    fingerprint TEXT,
+    cost INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (job_id, video_id)
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_pending ON job_items (state, job_id, priority);
+"""
+
+def published_timestamp(v):
+    try:
+        return datetime.fromisoformat(v.get('publishedAt', '').replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+def fetch_view_counts(youtube, video_ids):
+    counts = {}
+    for items in iter_video_batches(youtube, video_ids, part="statistics", fields=VIEW_COUNT_FIELDS):
+        for vid, item in items.items():
+            counts[vid] = int(item.get('statistics', {}).get('viewCount', 0))
+    return counts
+
+def job_priority(v, rule, position, view_counts=None):
+    # Lower runs first
+    if rule == 'newest':
+        return -published_timestamp(v)
+    if rule == 'oldest':
+        return published_timestamp(v)
+    if rule == 'most_viewed':
+        return -(view_counts or {}).get(v['id'], 0)
+    return position
+
+def job_item_cost(updates, thumbnail_path):
+    return (API_COSTS['videos.update'] if updates else 0) + (API_COSTS['thumbnails.set'] if thumbnail_path else 0)
+
+class JobQueue:
+    # Bulk edits persisted per video in the local database, so a run can stop and pick up again on a later day
+    def __init__(self, db):
+        self.db = db
+        with db.lock:
+            db.conn.executescript(JOB_QUEUE_SCHEMA)
+            columns = [row[1] for row in db.conn.execute('PRAGMA table_info(job_items)')]
+            if 'fingerprint' not in columns:  # Queues written before items were fingerprinted
+                db.conn.execute('ALTER TABLE job_items ADD COLUMN fingerprint TEXT')
+
+    def enqueue(self, name, jobs, priority_rule='newest', thumbnail_path=None, view_counts=None):
+        # Each item keeps the fingerprint of the video it was computed from, so a later edit makes it stale
+        now = time.time()
+        cost = lambda v, updates: job_item_cost(updates, resolve_thumbnail(thumbnail_path, v['id']))
+        rows = [(v['id'], job_priority(v, priority_rule, n, view_counts), json.dumps(updates), video_fingerprint(v), cost(v, updates), now)
+                for n, (v, updates) in enumerate(jobs)]
+        with self.db.lock, self.db.conn:
+            cursor = self.db.conn.execute('INSERT INTO jobs (name, created_at, priority_rule, thumbnail_path) VALUES (?, ?, ?, ?)',
+                                          (name, now, priority_rule, thumbnail_path))
+            job_id = cursor.lastrowid
+            self.db.conn.executemany(
+                'INSERT INTO job_items (job_id, video_id, priority, updates_json, fingerprint, cost, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(job_id,) + row for row in rows])
+        return job_id
+
+    def next_items(self, budget, job_id=None, limit=JOB_DISPATCH_SIZE):
+        # Highest-priority pending items whose combined cost fits in the budget
+        query = ('SELECT i.job_id, i.video_id, i.updates_json, i.fingerprint, i.cost, j.thumbnail_path FROM job_items i JOIN jobs j ON j.id = i.job_id '
+                 "WHERE i.state = 'pending'" + (' AND i.job_id = ?' if job_id is not None else '') +
+                 ' ORDER BY i.job_id, i.priority LIMIT ?')
+        params = ((job_id,) if job_id is not None else ()) + (limit,)
+        with self.db.lock:
+            rows = self.db.conn.execute(query, params).fetchall()
+        items = []
+        for row_job_id, video_id, updates_json, fingerprint, cost, thumbnail_path in rows:
+            if cost > budget:
                 break
-        except HttpError as e:
-            if e.resp.status in [429, 503]:
-                time.sleep(5)  # Backoff
+            budget -= cost
+            items.append({'job_id': row_job_id, 'video_id': video_id, 'updates': json.loads(updates_json), 'fingerprint': fingerprint,
+                          'cost': cost, 'thumbnail_path': thumbnail_path})
+        return items
+
+    def mark_done(self, item):
+        with self.db.lock, self.db.conn:
+            self.db.conn.execute("UPDATE job_items SET state = 'done', error = NULL, updated_at = ? WHERE job_id = ? AND video_id = ?",
+                                 (time.time(), item['job_id'], item['video_id']))
+
+    def mark_stale(self, item, reason):
+        # Never retried: the queued body was computed from a state the video is no longer in
+        with self.db.lock, self.db.conn:
+            self.db.conn.execute("UPDATE job_items SET state = 'stale', error = ?, updated_at = ? WHERE job_id = ? AND video_id = ?",
+                                 (reason, time.time(), item['job_id'], item['video_id']))
+
+    def mark_failed(self, item, error):
+        # Failed items go back in the queue until they run out of attempts
+        with self.db.lock, self.db.conn:
+            self.db.conn.execute(
+                "UPDATE job_items SET attempts = attempts + 1, error = ?, updated_at = ?, "
+                "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END WHERE job_id = ? AND video_id = ?",
+                (str(error), time.time(), JOB_MAX_ATTEMPTS, item['job_id'], item['video_id']))
+
+    def pending_count(self, job_id=None):
+        query = "SELECT COUNT(*) FROM job_items WHERE state = 'pending'" + (' AND job_id = ?' if job_id is not None else '')
+        with self.db.lock:
+            return self.db.conn.execute(query, (job_id,) if job_id is not None else ()).fetchone()[0]
+
+    def status(self):
+        with self.db.lock:
+            return self.db.conn.execute("""
+                SELECT j.id, j.name, j.priority_rule,
+                       SUM(i.state = 'pending'), SUM(i.state = 'done'), SUM(i.state IN ('failed', 'stale')),
+                       SUM(CASE WHEN i.state = 'pending' THEN i.cost ELSE 0 END)
+                FROM jobs j JOIN job_items i ON i.job_id = j.id GROUP BY j.id ORDER BY j.id
+            """).fetchall()
+
+class QuotaScheduler:
+    # Dispatches queued items only while today's remaining quota covers them and sleeps through the
+    # Pacific-midnight reset when the budget runs out. Items can wait for days, so each round refetches
+    # its videos first (1 unit per 50) and sends only the items whose video is still in the state they
+    # were computed from; every round is journaled like an apply run.
+    def __init__(self, job_queue, engine, store, reserve=0, log=print, token=None, journal_path=JOURNAL_FILE):
+        self.queue = job_queue
+        self.engine = engine
+        self.store = store
+        self.reserve = reserve
+        self.log = log
+        self.token = token
+        self.journal_path = journal_path
+
+    def refresh(self, items):
+        current = {}
+        for found in iter_video_batches(self.engine.service_factory(), [item['video_id'] for item in items]):
+            current.update(found)
+        refreshed = []
+        for vid, found in current.items():
+            v = self.store.get(vid)
+            if v is not None:
+                merge_video_item(v, found)
+                refreshed.append(v)
+        self.store.save(*refreshed)
+        return current
+
+    def check_items(self, items):
+        # (v, updates) jobs for the items still safe to send; the rest are settled here without a request
+        current = self.refresh(items)
+        jobs = []
+        for item in items:
+            v = self.store.get(item['video_id'])
+            if item['video_id'] not in current:
+                self.queue.mark_stale(item, "Video no longer exists on the channel")
+                self.log(f"Skipping {item['video_id']}: no longer on the channel")
                 continue
-            raise
-    if videos:
-        batch_size = 50
-        for i in range(0, len(videos), batch_size):
-            batch_ids = ','.join([v['id'] for v in videos[i:i + batch_size]])
-            try:
-                response = youtube.videos().list(
-                    part="snippet,status,recordingDetails",
-                    id=batch_ids
-                ).execute()
-                add_quota_usage('videos.list')
-                for item in response['items']:
-                    vid = item['id']
-                    for v in videos:
-                        if v['id'] == vid:
-                            v['categoryId'] = item['snippet'].get('categoryId', v['categoryId'])
-                            v['defaultLanguage'] = item['snippet'].get('defaultLanguage', v['defaultLanguage'])
-                            v['status'] = item['status']
-                            v['recordingDate'] = item.get('recordingDetails', {}).get('recordingDate', '')
-                            v['publishedAt'] = item['snippet'].get('publishedAt', v['publishedAt'])
-                            break
-            except HttpError as e:
-                if e.resp.status in [429, 503]:
-                    time.sleep(5)
+            if v is None:
+                self.queue.mark_stale(item, "Video is not in the local database; sync and queue it again")
+                self.log(f"Skipping {item['video_id']}: not in the local database")
+                continue
+            thumbnail_path = resolve_thumbnail(item['thumbnail_path'], v['id'])
+            updates = item['updates']
+            if updates and not diff_video_updates(v, updates):
+                # Already holds the queued values, e.g. sent just before a crash
+                if not thumbnail_path:
+                    self.queue.mark_done(item)
+                    self.log(f"{item['video_id']} already up to date")
                     continue
-                raise
-    with open(cache_file, 'w') as f:
-        json.dump(videos, f)
-    videos.sort(key=lambda x: x['title'].lower())
-    return videos
+                updates = {}
+            elif item['fingerprint'] and video_fingerprint(v) != item['fingerprint']:
+                self.queue.mark_stale(item, "Video changed since it was queued; queue it again")
+                self.log(f"Skipping {item['video_id']}: changed since it was queued")
+                continue
+            jobs.append((item, (v, updates), thumbnail_path))
+        return jobs
 
-def update_video(youtube, video_id, updates):
-    body = {'id': video_id}
-    if 'snippet' in updates:
-        body['snippet'] = updates['snippet']
-    if 'status' in updates:
-        body['status'] = updates['status']
-    if 'recordingDetails' in updates:
-        body['recordingDetails'] = updates['recordingDetails']
-    try:
-        youtube.videos().update(
-            part=','.join(updates.keys()),
-            body=body
-        ).execute()
-        add_quota_usage('videos.update')
-    except HttpError as e:
-        if e.resp.status in [429, 503]:
-            time.sleep(5)
-            update_video(youtube, video_id, updates)
+    def dispatch(self, items):
+        checked = self.check_items(items)
+        if not checked:
+            return
+        jobs = [job for _, job, _ in checked]
+        thumbnails = {job[0]['id']: path for _, job, path in checked if path}
+        by_job = {id(job): item for item, job, _ in checked}
+        journal = UpdateJournal(self.journal_path)
+        try:
+            run_id = journal.start_run({'queue_jobs': sorted({item['job_id'] for item in items})}, [v['id'] for v, _ in jobs],
+                                       jobs, thumbnails, queue=True)
+            results = run_journaled_updates(self.engine, journal, run_id, jobs, thumbnails, self.store, token=self.token)
+            if any(error for _, _, error in results):
+                journal.finish_run(run_id)  # What is left stays pending in the queue, not in the journal
+        finally:
+            journal.close()
+        for job, _, error in results:
+            item = by_job[id(job)]
+            if error is None:
+                self.queue.mark_done(item)
+                self.log(f"Updated {item['video_id']}")
+            elif not (is_quota_error(error) or isinstance(error, TaskCancelled)):  # Those stay pending
+                self.queue.mark_failed(item, error)
+                self.log(f"Error updating {item['video_id']}: {error}")
+
+    def wait_for_reset(self):
+        reset = next_quota_reset()
+        self.log(f"Daily quota used up; pausing until {reset.strftime('%Y-%m-%d %H:%M %Z')}")
+        delay = max(0, reset.timestamp() - time.time()) + QUOTA_RESET_MARGIN_SECONDS
+        if self.token is not None:
+            self.token.cancelled.wait(delay)
+            self.token.check()
         else:
-            raise
+            time.sleep(delay)
+
+    def run(self, job_id=None, wait=True):
+        # Returns True once the queue is drained, False if it paused without waiting
+        while True:
+            refresh_cost = -(-JOB_DISPATCH_SIZE // VIDEOS_PER_REQUEST) * API_COSTS['videos.list']
+            items = self.queue.next_items(get_remaining_quota() - self.reserve - refresh_cost, job_id)
+            if not items:
+                if not self.queue.pending_count(job_id):
+                    return True
+                if not wait:
+                    self.log("Daily quota used up; queue paused")
+                    return False
+                self.wait_for_reset()
+                continue
+            self.dispatch(items)
+            if self.token is not None:
+                self.token.check()
+
+# Headless command line
+EXIT_OK = 0
+EXIT_FAILURES = 1  # Some videos failed
+EXIT_ERROR = 2  # Bad arguments or settings
+
+def cli_print(msg):
+    print(msg, flush=True)
+
+def cli_connect(args):
+    creds = get_credentials(args.token)
+    return creds, build_service(creds)
+
+def cli_load_videos(args, youtube):
+    db = VideoDatabase(args.db)
+    return VideoStore(get_all_videos(youtube, db), db=db)
+
+def cli_select(args, store):
+    if args.all:
+        return list(store)
+    if args.search is not None:
+        result = SearchIndex(store).search(args.search)
+        if result is None:
+            raise ValueError(f"Search query {args.search!r} has no words to search for")
+        return [v for v in store if v['id'] in result]
+    if args.ids_file:
+        with open(args.ids_file, 'r') as f:
+            video_ids = [line.strip() for line in f if line.strip()]
+    else:
+        video_ids = [vid.strip() for vid in args.ids.split(',') if vid.strip()]
+    return store.get_many(video_ids)
+
+def cli_load_edit(args):
+    with open(args.settings, 'r') as f:
+        return CompiledEdit(json.load(f))
+
+def cli_report(results, verb):
+    failures = sum(1 for _, _, error in results if error)
+    cli_print(f"{len(results) - failures} {verb}, {failures} failed, {quota_ledger.units} quota units used today")
+    cli_print(api_metrics.summary())
+    return EXIT_FAILURES if failures else EXIT_OK
+
+def cli_sync(args):
+    creds, youtube = cli_connect(args)
+    db = VideoDatabase(args.db)
+    videos = get_all_videos(youtube, db, refresh=True, incremental=not args.full, service_factory=lambda: build_service(creds))
+    cli_print(f"Synced {len(videos)} videos")
+    return EXIT_OK
+
+def cli_preview(args):
+    edit = cli_load_edit(args)
+    _, youtube = cli_connect(args)
+    selected_vids = cli_select(args, cli_load_videos(args, youtube))
+    sys.stdout.write(preview_summary(edit, selected_vids))
+    for entry in iter_preview(edit, selected_vids):
+        sys.stdout.write(entry)
+    return EXIT_OK
+
+def cli_run_update(args, creds, store, settings, video_ids):
+    edit = CompiledEdit(settings)
+    selected_vids = store.get_many(video_ids)
+    jobs = edit.build_jobs(selected_vids)
+    skipped = len(selected_vids) - len(jobs)
+    saved = skipped_update_units(selected_vids, jobs)
+    if saved:
+        cli_print(f"Skipping {skipped} unchanged videos (saves {saved} quota units)")
+    thumbnails = edit.thumbnail_map(jobs)
+    journal = UpdateJournal(args.journal)
+    run_id = journal.start_run(settings, video_ids, jobs, thumbnails)
+    return cli_execute_jobs(args, creds, store, journal, run_id, jobs, thumbnails)
+
+def cli_execute_jobs(args, creds, store, journal, run_id, jobs, thumbnails):
+    cli_print(f"Run {run_id}")
+    engine = UpdateEngine(lambda: build_service(creds), max_workers=args.workers)
+    done = []
+
+    def on_result(job, result, error):
+        done.append(job)
+        status = f"Error updating {job[0]['id']}: {error}" if error else f"Updated {job[0]['id']}"
+        cli_print(f"[{len(done)}/{len(jobs)}] {status}")
 
-def set_thumbnail(youtube, video_id, thumbnail_path):
-    mime_type = mimetypes.guess_type(thumbnail_path)[0] or 'image/jpeg'
     try:
-        youtube.thumbnails().set(
-            videoId=video_id,
-            media_body=MediaFileUpload(thumbnail_path, mimetype=mime_type)
-        ).execute()
-        add_quota_usage('thumbnails.set')
-    except HttpError as e:
-        if e.resp.status in [429, 503]:
-            time.sleep(5)
-            set_thumbnail(youtube, video_id, thumbnail_path)
-        else:
-            raise
+        results = run_journaled_updates(engine, journal, run_id, jobs, thumbnails, store, result_callback=on_result)
+    finally:
+        journal.close()
+    return cli_report(results, "updated")
 
-def compute_new_desc(desc, action, footer, find, replace, keyword, trim_m, use_regex):
-    new_desc = desc
-    changed = False
-    if action == "append":
-        new_desc = desc + "\n\n" + footer
-        changed = True
-    elif action == "prepend":
-        new_desc = footer + "\n\n" + desc
-        changed = True
-    elif action == "replace_all":
-        new_desc = footer
-        changed = True
-    elif action == "find_replace":
-        if find:
-            if use_regex:
-                new_desc = re.sub(find, replace, desc, flags=re.IGNORECASE)
-            else:
-                new_desc = desc.replace(find, replace)
-            changed = new_desc != desc
-    elif action == "trim":
-        if keyword and trim_m != "none":
-            if use_regex:
-                match = re.search(keyword, desc, flags=re.IGNORECASE)
-                if match:
-                    if trim_m == "before":
-                        new_desc = desc[match.start():]
-                    elif trim_m == "after":
-                        new_desc = desc[:match.end()]
-                    changed = True
-            else:
-                parts = desc.partition(keyword)
-                if parts[1]:
-                    if trim_m == "before":
-                        new_desc = parts[1] + parts[2]
-                    elif trim_m == "after":
-                        new_desc = parts[0] + parts[1]
-                    changed = True
-    elif action == "replace_after":
-        if keyword:
-            if use_regex:
-                match = re.search(keyword, desc, flags=re.IGNORECASE)
-                if match:
-                    new_desc = desc[:match.end()] + footer
-                    changed = True
-            else:
-                parts = desc.partition(keyword)
-                if parts[1]:
-                    new_desc = parts[0] + parts[1] + footer
-                    changed = True
-    if len(new_desc) > 5000:
-        new_desc = new_desc[:5000]  # Truncate to API limit
-        changed = True
-    return new_desc, changed
+def cli_apply(args):
+    edit = cli_load_edit(args)
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    return cli_run_update(args, creds, store, edit.settings, [v['id'] for v in cli_select(args, store)])
 
-def compute_new_title(title, title_action, title_text):
-    new_title = title
-    changed = False
-    if title_action == "append":
-        new_title = title + " " + title_text
-        changed = True
-    elif title_action == "prepend":
-        new_title = title_text + " " + title
-        changed = True
-    elif title_action == "replace":
-        new_title = title_text
-        changed = True
-    if len(new_title) > 100:
-        new_title = new_title[:100]
-        changed = True
-    return new_title, changed
+def cli_plan(args):
+    edit = cli_load_edit(args)
+    _, youtube = cli_connect(args)
+    plan = build_plan(edit, cli_select(args, cli_load_videos(args, youtube)))
+    save_plan(plan, args.output)
+    cli_print(f"Plan saved to {args.output}")
+    sys.stdout.write(plan_summary(plan))
+    return EXIT_OK
 
-def compute_new_tags(tags, tags_action, tags_text):
-    new_tags = tags[:]
-    changed = False
-    if tags_action == "add":
-        new_tags.extend([t.strip() for t in tags_text.split(',') if t.strip()])
-        changed = True
-    elif tags_action == "replace":
-        new_tags = [t.strip() for t in tags_text.split(',') if t.strip()]
-        changed = True
-    elif tags_action == "remove":
-        remove_set = set([t.strip() for t in tags_text.split(',') if t.strip()])
-        new_tags = [t for t in new_tags if t not in remove_set]
-        changed = True
-    new_tags = optimize_tags(new_tags)
-    return new_tags, changed
+def cli_apply_plan(args):
+    plan = load_plan(args.plan)
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    jobs, thumbnails, stale, missing, applied = apply_plan_jobs(plan, store, UpdateJournal.plan_done(args.journal, plan['source']['sha1']))
+    if applied:
+        cli_print(f"Skipping {len(applied)} videos an earlier run of this plan already updated")
+    if stale:
+        cli_print(f"Skipping {len(stale)} videos changed since the plan was made: {', '.join(stale[:10])}{' ...' if len(stale) > 10 else ''}")
+    if missing:
+        cli_print(f"Skipping {len(missing)} videos no longer on the channel")
+    # Journaled against the plan file, so resume can finish an interrupted replay and a re-run skips what is done
+    journal = UpdateJournal(args.journal)
+    run_id = journal.start_run(plan['settings'], [v['id'] for v, _ in jobs], jobs, thumbnails, plan['source'])
+    return cli_execute_jobs(args, creds, store, journal, run_id, jobs, thumbnails)
 
-def optimize_tags(tags):
-    unique_tags = list(set(tags))  # Remove duplicates
-    unique_tags.sort()  # Sort alphabetically
-    return unique_tags[:30]  # Limit to reasonable number
+def cli_resume(args):
+    run = UpdateJournal.find_run(args.journal, args.run)
+    if run is None:
+        cli_print("No interrupted run to resume")
+        return EXIT_OK
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    jobs, thumbnails = journaled_jobs(run, store)
+    cli_print(f"Resuming run {run['run_id']}: {len(run['done'])} videos already done")
+    return cli_execute_jobs(args, creds, store, UpdateJournal(args.journal), run['run_id'], jobs, thumbnails)
+
+def cli_run_queue(args, creds, store, job_queue, job_id=None):
+    engine = UpdateEngine(lambda: build_service(creds), max_workers=args.workers)
+    scheduler = QuotaScheduler(job_queue, engine, store, log=cli_print, journal_path=args.journal)
+    drained = scheduler.run(job_id, wait=not args.no_wait)
+    for row in job_queue.status():
+        if job_id is None or row[0] == job_id:
+            cli_print(f"Job {row[0]}: {row[4]} done, {row[3]} pending, {row[5]} failed")
+    return EXIT_OK if drained else EXIT_FAILURES
+
+def cli_schedule(args):
+    edit = cli_load_edit(args)
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    selected_vids = cli_select(args, store)
+    jobs = edit.build_jobs(selected_vids)
+    view_counts = fetch_view_counts(youtube, [v['id'] for v, _ in jobs]) if args.priority == 'most_viewed' else None
+    job_queue = JobQueue(store.db)
+    job_id = job_queue.enqueue(args.settings, jobs, args.priority, edit.thumbnail_path, view_counts)
+    cli_print(f"Queued job {job_id}: {len(jobs)} videos, {sum(job_item_cost(u, edit.thumbnail_for(v)) for v, u in jobs)} quota units")
+    if args.enqueue_only:
+        return EXIT_OK
+    return cli_run_queue(args, creds, store, job_queue, job_id)
+
+def cli_queue(args):
+    if args.status:
+        for job_id, name, rule, pending, done, failed, pending_cost in JobQueue(VideoDatabase(args.db)).status():
+            cli_print(f"Job {job_id} ({name}, {rule}): {pending} pending ({pending_cost} units), {done} done, {failed} failed")
+        return EXIT_OK
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    return cli_run_queue(args, creds, store, JobQueue(store.db), args.job)
+
+def cli_backup(args):
+    _, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    path, count, changed = backup_videos(youtube, store, args.dir, full=args.full)
+    cli_print(f"Backed up {count} videos to {path} ({changed} new or changed since the last snapshot)")
+    return EXIT_OK
+
+def cli_restore(args):
+    if not (args.input or latest_backup()):
+        cli_print("No backup found")
+        return EXIT_ERROR
+    wanted = set(vid.strip() for vid in args.ids.split(',')) if args.ids else None
+    creds, youtube = cli_connect(args)
+    store = cli_load_videos(args, youtube)
+    jobs, unchanged, missing = plan_restore(youtube, store, iter_backup(args.input, wanted), live=not args.cached)
+    cli_print(f"{len(jobs)} videos differ from the backup, {unchanged} already match")
+    if missing:
+        cli_print(f"Skipping {len(missing)} videos that no longer exist on the channel")
+    engine = UpdateEngine(lambda: build_service(creds), max_workers=args.workers)
+    done = []
+
+    def on_result(job, result, error):
+        done.append(job)
+        status = f"Error restoring {job[0]['id']}: {error}" if error else f"Restored {job[0]['id']}"
+        cli_print(f"[{len(done)}/{len(jobs)}] {status}")
+
+    results = engine.run(jobs, lambda yt, job: apply_video_update(yt, job[0], job[1], None, engine.limiter, store),
+                         result_callback=on_result)
+    return cli_report(results, "restored")
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(prog='youtube_bulk_edit.py', description="Martocci Mayhem YouTube Bulk Editor (headless mode). Run without arguments for the GUI.")
+    parser.add_argument('--token', default='token.pickle', help="OAuth token file")
+    parser.add_argument('--db', default=VIDEO_DB_FILE, help="Local video database")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Concurrent API workers")
+    parser.add_argument('--journal', default=JOURNAL_FILE, help="Write-ahead journal for apply and resume")
+    parser.add_argument('--metrics-dir', default=METRICS_DIR, help="Where to write per-run JSON metrics and the Prometheus text file ('' to disable)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync = commands.add_parser('sync', help="Sync the local video database with the channel")
+    sync.add_argument('--full', action='store_true', help="Refetch every video instead of syncing incrementally")
+    sync.set_defaults(func=cli_sync)
+
+    for name, func, help_text in [('preview', cli_preview, "Print the changes an edit would make"),
+                                  ('plan', cli_plan, "Write the exact requests an edit would send to a plan file, without sending them"),
+                                  ('apply', cli_apply, "Apply an edit to the selected videos"),
+                                  ('schedule', cli_schedule, "Queue an edit and run it across as many days as its quota needs")]:
+        command = commands.add_parser(name, help=help_text)
+        if name == 'schedule':
+            command.add_argument('--priority', choices=JOB_PRIORITIES, default='newest', help="Order in which videos are updated")
+            command.add_argument('--enqueue-only', action='store_true', help="Queue the job without running it")
+            command.add_argument('--no-wait', action='store_true', help="Stop instead of waiting for the daily quota reset")
+        if name == 'plan':
+            command.add_argument('--output', default=PLAN_FILE, help="Plan file to write")
+        command.add_argument('--settings', default='settings.json', help="Edit parameters, as written by Save Settings")
+        selection = command.add_mutually_exclusive_group(required=True)
+        selection.add_argument('--all', action='store_true', help="Every video on the channel")
+        selection.add_argument('--ids', help="Comma-separated video IDs")
+        selection.add_argument('--ids-file', help="File with one video ID per line")
+        selection.add_argument('--search', help="Videos matching a search query")
+        command.set_defaults(func=func)
+
+    apply_plan = commands.add_parser('apply-plan', help="Send the requests of a plan file as they are, without recomputing the edit")
+    apply_plan.add_argument('--plan', default=PLAN_FILE, help="Plan file written by the plan command or Dry Run")
+    apply_plan.set_defaults(func=cli_apply_plan)
+
+    resume = commands.add_parser('resume', help="Finish an interrupted apply run, skipping videos it already updated")
+    resume.add_argument('--run', help="Run ID (default: the most recent unfinished run)")
+    resume.set_defaults(func=cli_resume)
+
+    queue_command = commands.add_parser('queue', help="Run queued jobs, or show their status")
+    queue_command.add_argument('--status', action='store_true', help="Show queued jobs and exit")
+    queue_command.add_argument('--job', type=int, help="Only run this job")
+    queue_command.add_argument('--no-wait', action='store_true', help="Stop instead of waiting for the daily quota reset")
+    queue_command.set_defaults(func=cli_queue)
+
+    backup = commands.add_parser('backup', help="Back up snippet, status and recording details of every video")
+    backup.add_argument('--dir', default=BACKUP_DIR, help="Snapshot directory")
+    backup.add_argument('--full', action='store_true', help="Keep every field of each part, not just the ones restore uses")
+    backup.set_defaults(func=cli_backup)
+
+    restore = commands.add_parser('restore', help="Restore videos from a backup")
+    restore.add_argument('--input', help="Snapshot file or legacy backup.json (default: the newest snapshot)")
+    restore.add_argument('--ids', help="Only restore these comma-separated video IDs")
+    restore.add_argument('--cached', action='store_true', help="Compare with the local database instead of refetching current state")
+    restore.set_defaults(func=cli_restore)
+    return parser
+
+def cli_main(argv):
+    args = build_cli_parser().parse_args(argv)
+    load_quota()
+    before, started = api_metrics.snapshot(), time.time()
+    try:
+        return args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except HttpError as e:
+        print(f"API error: {e}", file=sys.stderr)
+        return EXIT_FAILURES
+    finally:
+        if args.metrics_dir:
+            try:
+                save_job_metrics(args.command, before, started, args.metrics_dir)
+            except Exception as e:  # Never let the metrics replace the command's exit code
+                print(f"Could not save metrics: {e}", file=sys.stderr)
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(cli_main(sys.argv[1:]))
+    import tkinter as tk
+    from tkinter import messagebox, scrolledtext, END, MULTIPLE, filedialog
+    from tkinter import ttk
+
     # GUI setup first, auth later
+    load_quota()
     root = tk.Tk()
     root.title("Martocci Mayhem YouTube Bulk Editor - @JasonMartocci")
     root.configure(bg=BG_COLOR)
@@ -477,19 +3279,26 @@ if __name__ == '__main__':
     search_entry.pack(fill='x')
 
     ttk.Label(left_frame, text="Select Videos:").pack(anchor='w', pady=5)
-    video_tree = ttk.Treeview(left_frame, columns=("Title", "ID", "Privacy"), show="headings", height=30)
-    video_tree.heading("Title", text="Title")
+    tree_frame = ttk.Frame(left_frame)
+    tree_frame.pack(fill='both', expand=True)
+    video_tree = ttk.Treeview(tree_frame, columns=("Title", "ID", "Privacy", "Published"), show="headings", height=30)
+    tree_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+    video_list = VideoListView(video_tree, tree_scrollbar)
+    video_tree.heading("Title", text="Title", command=lambda: video_list.sort_by("Title"))
     video_tree.heading("ID", text="ID")
-    video_tree.heading("Privacy", text="Privacy")
+    video_tree.heading("Privacy", text="Privacy", command=lambda: video_list.sort_by("Privacy"))
+    video_tree.heading("Published", text="Published", command=lambda: video_list.sort_by("Published"))
     video_tree.column("Title", width=400)
     video_tree.column("ID", width=100)
     video_tree.column("Privacy", width=100)
-    video_tree.pack(fill='both', expand=True)
+    video_tree.column("Published", width=100)
+    video_tree.pack(side='left', fill='both', expand=True)
+    tree_scrollbar.pack(side='right', fill='y')
 
     select_buttons_frame = ttk.Frame(left_frame)
     select_buttons_frame.pack(pady=10, fill='x')
-    ttk.Button(select_buttons_frame, text="Select All", command=lambda: [video_tree.selection_add(video_tree.get_children())]).pack(side='left', padx=5)
-    ttk.Button(select_buttons_frame, text="Deselect All", command=lambda: video_tree.selection_remove(video_tree.get_children())).pack(side='left', padx=5)
+    ttk.Button(select_buttons_frame, text="Select All", command=video_list.select_all).pack(side='left', padx=5)
+    ttk.Button(select_buttons_frame, text="Deselect All", command=video_list.deselect_all).pack(side='left', padx=5)
     refresh_button = ttk.Button(select_buttons_frame, text="Refresh Videos")
     refresh_button.pack(side='left', padx=5)
 
@@ -635,10 +3444,11 @@ if __name__ == '__main__':
     edit_notebook.add(thumbnail_tab, text='Thumbnail')
 
     thumbnail_path_var = tk.StringVar()
-    ttk.Label(thumbnail_tab, text="Thumbnail File Path:").pack(anchor='w', pady=5, padx=5)
+    ttk.Label(thumbnail_tab, text="Thumbnail File Path (or a folder of <video ID>.jpg files):").pack(anchor='w', pady=5, padx=5)
     thumbnail_entry = ttk.Entry(thumbnail_tab, textvariable=thumbnail_path_var, width=70)
     thumbnail_entry.pack(fill='x', pady=5, padx=5)
     ttk.Button(thumbnail_tab, text="Browse", command=lambda: thumbnail_path_var.set(filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png")]))).pack(anchor='w', pady=5, padx=5)
+    ttk.Button(thumbnail_tab, text="Browse Folder", command=lambda: thumbnail_path_var.set(filedialog.askdirectory())).pack(anchor='w', pady=5, padx=5)
 
     # Language tab
     language_tab = ttk.Frame(edit_notebook, padding=10)
@@ -668,6 +3478,14 @@ if __name__ == '__main__':
     output_notebook.add(preview_frame, text='Preview')
     preview_text = scrolledtext.ScrolledText(preview_frame, height=15, width=80, bg='white', fg=TEXT_COLOR, font=('Arial', 11))
     preview_text.pack(fill='both', expand=True)
+    preview_pager = ttk.Frame(preview_frame)
+    preview_pager.pack(fill='x')
+    preview_prev_button = ttk.Button(preview_pager, text="< Prev")
+    preview_prev_button.pack(side='left', padx=5, pady=2)
+    preview_page_label = ttk.Label(preview_pager, text="")
+    preview_page_label.pack(side='left', padx=5)
+    preview_next_button = ttk.Button(preview_pager, text="Next >")
+    preview_next_button.pack(side='left', padx=5, pady=2)
 
     log_frame = ttk.Frame(output_notebook, relief='groove', borderwidth=2)
     output_notebook.add(log_frame, text='Log')
@@ -680,17 +3498,33 @@ if __name__ == '__main__':
 
     progress = ttk.Progressbar(button_frame, orient='horizontal', length=400, mode='determinate')
     progress.pack(fill='x', pady=5)
+    progress_label = ttk.Label(button_frame, text="")
+    progress_label.pack(anchor='w', padx=10)
 
     backup_button = ttk.Button(button_frame, text="Backup")
     backup_button.pack(side='left', padx=10)
+    full_backup_var = tk.IntVar(value=0)
+    ttk.Checkbutton(button_frame, text="Full", variable=full_backup_var).pack(side='left')
     restore_button = ttk.Button(button_frame, text="Restore")
     restore_button.pack(side='left', padx=10)
     preview_button = ttk.Button(button_frame, text="Preview")
     preview_button.pack(side='left', padx=10)
     dry_run_button = ttk.Button(button_frame, text="Dry Run")
     dry_run_button.pack(side='left', padx=10)
+    apply_plan_button = ttk.Button(button_frame, text="Apply Plan")
+    apply_plan_button.pack(side='left', padx=10)
     update_button = ttk.Button(button_frame, text="Update")
     update_button.pack(side='left', padx=10)
+    resume_button = ttk.Button(button_frame, text="Resume Run")
+    resume_button.pack(side='left', padx=10)
+    pause_button = ttk.Button(button_frame, text="Pause")
+    pause_button.pack(side='left', padx=10)
+    cancel_button = ttk.Button(button_frame, text="Cancel")
+    cancel_button.pack(side='left', padx=10)
+    schedule_button = ttk.Button(button_frame, text="Schedule")
+    schedule_button.pack(side='left', padx=10)
+    priority_var = tk.StringVar(value=JOB_PRIORITIES[0])
+    ttk.Combobox(button_frame, textvariable=priority_var, values=JOB_PRIORITIES, state='readonly', width=12).pack(side='left')
 
     def save_log():
         file = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
@@ -705,8 +3539,8 @@ if __name__ == '__main__':
     # Save/load settings
     settings_button_frame = ttk.Frame(button_frame)
     settings_button_frame.pack(side='left', padx=10)
-    def save_settings():
-        settings = {
+    def read_edit_settings():
+        return {
             'action': action_var.get(),
             'footer': footer_entry.get(1.0, END).strip(),
             'find': find_entry.get(),
@@ -728,6 +3562,9 @@ if __name__ == '__main__':
             'language': language_var.get(),
             'recording_date': recording_var.get(),
         }
+
+    def save_settings():
+        settings = read_edit_settings()
         with open('settings.json', 'w') as f:
             json.dump(settings, f)
         messagebox.showinfo("Info", "Settings saved")
@@ -773,17 +3610,11 @@ if __name__ == '__main__':
     csv_button_frame = ttk.Frame(button_frame)
     csv_button_frame.pack(side='left', padx=10)
     def export_csv():
-        selected_items = video_tree.selection()
+        selected_items = video_list.selection()
         if not selected_items:
             messagebox.showwarning("Warning", "No videos selected")
             return
-        selected_vids = []
-        for item in selected_items:
-            vid_id = video_tree.item(item)['values'][1]
-            for v in videos:
-                if v['id'] == vid_id:
-                    selected_vids.append(v)
-                    break
+        selected_vids = videos.get_many(selected_items)
         file = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file:
             with open(file, 'w', newline='') as f:
@@ -799,72 +3630,158 @@ if __name__ == '__main__':
             with open(file, 'r') as f:
                 reader = csv.reader(f)
                 next(reader)  # Skip header
+                imported = 0
                 for row in reader:
                     vid_id, title, desc, tags, category, privacy = row
-                    for v in videos:
-                        if v['id'] == vid_id:
-                            v['title'] = title
-                            v['description'] = desc
-                            v['tags'] = tags.split(',')
-                            v['categoryId'] = next((k for k, val in CATEGORIES.items() if val == category), v['categoryId'])
-                            v['status']['privacyStatus'] = privacy
-                            break
-            messagebox.showinfo("Info", "Imported from CSV")
+                    v = videos.get(vid_id)
+                    if v is not None:
+                        # Kept out of the database until an Update sends it, so the cache still matches the server
+                        csv_pending.setdefault(vid_id, v.to_dict())
+                        v['title'] = title
+                        v['description'] = desc
+                        v['tags'] = tags.split(',')
+                        v['categoryId'] = next((k for k, val in CATEGORIES.items() if val == category), v['categoryId'])
+                        v['status']['privacyStatus'] = privacy
+                        videos.search_index.add(v)
+                        imported += 1
+            messagebox.showinfo("Info", f"Imported {imported} videos from CSV. Run Update to send the imported values.")
             populate_video_list(videos)
 
     ttk.Button(csv_button_frame, text="Export CSV", command=export_csv).pack(side='left', padx=5)
     ttk.Button(csv_button_frame, text="Import CSV", command=import_csv).pack(side='left', padx=5)
 
     # Auth and load
-    youtube = None
-    videos = []
-    cache_file = 'videos_cache.json'
+    youtube = None  # Set once connected; googleapiclient services are not thread-safe, so other tasks build their own from creds
+    creds = None
+    video_db = VideoDatabase(VIDEO_DB_FILE)
+    videos = VideoStore(db=video_db, search_index=SearchIndex())
+    csv_pending = {}  # Video ID -> server state, for videos with imported CSV values not yet sent
     token_file = 'token.pickle'
 
     def populate_video_list(vids):
-        video_tree.delete(*video_tree.get_children())
-        for v in vids:
-            video_tree.insert("", END, values=(v['title'], v['id'], v['status']['privacyStatus']))
+        video_list.invalidate_sort_keys()
+        video_list.set_rows(vids)
 
-    def filter_videos(event=None):
-        search_term = search_var.get().lower()
-        video_tree.delete(*video_tree.get_children())
-        for v in videos:
-            if search_term in v['title'].lower() or search_term in v['id']:
-                video_tree.insert("", END, values=(v['title'], v['id'], v['status']['privacyStatus']))
+    def stream_videos():
+        # on_videos callback for get_all_videos: shows the rows loaded so far, redrawn at most every
+        # STREAM_REDRAW_SECONDS. The final list replaces them once loading completes.
+        loaded = []
+        last_shown = [0.0]
 
-    search_entry.bind("<KeyRelease>", filter_videos)
+        def on_videos(batch):
+            loaded.extend(batch)
+            if time.monotonic() - last_shown[0] >= STREAM_REDRAW_SECONDS:
+                last_shown[0] = time.monotonic()
+                rows = sorted(loaded, key=lambda x: x['title'].lower())
+                root.after(0, populate_video_list, rows)
+        return on_videos
 
-    task_queue = queue.Queue()
+    last_search = {'query': None, 'result': None, 'after_id': None}
 
-    def background_worker():
-        while True:
-            task = task_queue.get()
-            if task is None:
-                break
-            func, args, callback = task
+    def filter_videos(event=None, narrow=False):
+        query = search_var.get().lower().strip()
+        previous = last_search['query']
+        # While typing, a query that extends the last one can only narrow its result
+        candidates = last_search['result'] if narrow and previous and query.startswith(previous) else None
+        result = videos.search_index.search(query, candidates)
+        last_search['query'], last_search['result'] = query, result
+        video_list.set_rows(v for v in videos if result is None or v['id'] in result)
+
+    def schedule_filter(event=None):
+        if last_search['after_id']:
+            root.after_cancel(last_search['after_id'])
+        last_search['after_id'] = root.after(SEARCH_DEBOUNCE_MS, run_scheduled_filter)
+
+    def run_scheduled_filter():
+        last_search['after_id'] = None
+        filter_videos(narrow=True)
+
+    search_entry.bind("<KeyRelease>", schedule_filter)
+
+    # Interactive work (connect, refresh, preview) and bulk work (update, backup, restore) run in separate
+    # lanes, so a long bulk job never blocks the rest of the window
+    def background_error(e):
+        if isinstance(e, TaskCancelled):
+            log_text.insert(END, "Cancelled\n")
+        else:
+            log_text.insert(END, f"Background error: {str(e)}\n")
+        log_text.see(END)
+
+    executor = TaskExecutor(dispatch=lambda func, *args: root.after(0, func, *args), on_error=background_error)
+    bulk_tokens = set()
+    bulk_state = {'paused': False}
+    api_limiter = RateLimiter()  # Shared by every engine, so tasks running at once stay within the rate together
+
+    def run_in_background(func, args=(), callback=None, priority=PRIORITY_NORMAL):
+        executor.submit(func, args, callback, priority=priority)
+
+    def measured(func):
+        # Writes a metrics summary for each run of an API-bound task
+        def task(*args):
+            before, started = api_metrics.snapshot(), time.time()
             try:
-                result = func(*args)
-                if callback:
-                    root.after(0, callback, result)
-            except Exception as e:
-                root.after(0, lambda e=e: log_text.insert(END, f"Background error: {str(e)}\n"))
-            task_queue.task_done()
+                return func(*args)
+            finally:
+                try:
+                    save_job_metrics(func.__name__.replace('_threaded', ''), before, started)
+                except Exception as e:  # Never let the metrics replace the task's own result
+                    print(f"Could not save metrics: {e}", file=sys.stderr)
+        return task
 
-    worker_thread = threading.Thread(target=background_worker, daemon=True)
-    worker_thread.start()
+    def new_bulk_token():
+        token = TaskToken()
+        if bulk_state['paused']:
+            token.pause()
+        bulk_tokens.add(token)
+        return token
 
-    def run_in_background(func, args=(), callback=None):
-        task_queue.put((func, args, callback))
+    def run_bulk(func, args=(), callback=None, priority=PRIORITY_NORMAL):
+        # The task's token is passed as its last argument so Pause and Cancel reach its loops
+        token = new_bulk_token()
+
+        def task(*task_args):
+            try:
+                return measured(func)(*task_args)
+            finally:
+                root.after(0, bulk_tokens.discard, token)  # bulk_tokens belongs to the Tk thread
+                root.after(0, lambda: progress_label.config(text=""))
+
+        executor.submit(task, args + (token,), callback, lane='bulk', priority=priority, token=token)
+
+    def show_progress(done, total, eta):
+        progress.config(maximum=max(total, 1), value=done)
+        progress_label.config(text=format_progress(done, total, eta))
+
+    def bulk_progress():
+        return ProgressReporter(lambda done, total, eta: root.after(0, show_progress, done, total, eta))
+
+    def toggle_pause():
+        bulk_state['paused'] = not bulk_state['paused']
+        for token in list(bulk_tokens):
+            if bulk_state['paused']:
+                token.pause()
+            else:
+                token.resume()
+        pause_button.config(text="Continue" if bulk_state['paused'] else "Pause")
+        log_text.insert(END, "Bulk tasks paused\n" if bulk_state['paused'] else "Bulk tasks continued\n")
+
+    def cancel_bulk():
+        if not bulk_tokens:
+            return
+        if messagebox.askyesno("Cancel", "Cancel the running and queued bulk tasks? Videos already sent stay updated."):
+            for token in list(bulk_tokens):
+                token.cancel()
 
     def connect_account():
-        run_in_background(connect_account_threaded, callback=connect_callback)
+        run_in_background(measured(connect_account_threaded), callback=connect_callback, priority=PRIORITY_HIGH)
 
     def connect_account_threaded():
-        global youtube, videos
-        youtube = get_authenticated_service(token_file)
-        videos = get_all_videos(youtube, cache_file)
-        return get_current_channel(youtube)
+        global youtube, creds
+        creds = get_credentials(token_file)
+        youtube = service = build_service(creds)
+        videos.replace(get_all_videos(service, video_db, service_factory=lambda: build_service(creds), on_videos=stream_videos()))
+        csv_pending.clear()  # Unsent CSV values are replaced by the server state
+        return get_current_channel(service)
 
     def connect_callback(channel):
         account_label.config(text="Account: " + channel, foreground=TEAL if not is_dark_mode else DARK_TEAL)
@@ -885,18 +3802,17 @@ if __name__ == '__main__':
 
     def refresh_videos():
         if youtube:
-            run_in_background(refresh_videos_threaded, callback=refresh_callback)
+            run_in_background(measured(refresh_videos_threaded), callback=refresh_callback)
         else:
             messagebox.showwarning("Warning", "Connect account first")
 
     def refresh_videos_threaded():
-        if os.path.exists(cache_file):
-            os.remove(cache_file)
-        return get_all_videos(youtube, cache_file)
+        # Rebuilds the search index off the UI thread
+        csv_pending.clear()  # Unsent CSV values are replaced by the server state
+        videos.replace(get_all_videos(build_service(creds), video_db, refresh=True, service_factory=lambda: build_service(creds),
+                                      on_videos=stream_videos()))
 
-    def refresh_callback(new_videos):
-        global videos
-        videos = new_videos
+    def refresh_callback(result):
         populate_video_list(videos)
         filter_videos()
         log_text.insert(END, "Videos refreshed\n")
@@ -907,79 +3823,57 @@ if __name__ == '__main__':
     # Backup function
     def backup():
         if youtube:
-            run_in_background(backup_threaded, callback=backup_callback)
+            run_bulk(backup_threaded, (bool(full_backup_var.get()),), callback=backup_callback, priority=PRIORITY_LOW)
         else:
             messagebox.showwarning("Warning", "Connect account first")
 
-    def backup_threaded():
-        backup_data = []
-        batch_size = 50
-        video_ids = [v['id'] for v in videos]
-        for i in range(0, len(video_ids), batch_size):
-            batch_ids = ','.join(video_ids[i:i + batch_size])
-            response = youtube.videos().list(
-                part="snippet,status,recordingDetails",
-                id=batch_ids
-            ).execute()
-            add_quota_usage('videos.list')
-            for item in response['items']:
-                backup_data.append({
-                    'id': item['id'],
-                    'snippet': item['snippet'],
-                    'status': item['status'],
-                    'recordingDetails': item.get('recordingDetails', {})
-                })
-        with open('backup.json', 'w') as f:
-            json.dump(backup_data, f)
-        return "Backup saved to backup.json\n"
+    def backup_threaded(full, token):
+        path, count, changed = backup_videos(build_service(creds), videos, token=token, full=full)
+        return f"Backup saved to {path}: {count} videos, {changed} new or changed since the last snapshot\n"
 
     def backup_callback(msg):
         log_text.insert(END, msg)
 
     # Restore function
     def restore():
-        if youtube:
-            if os.path.exists('backup.json'):
-                run_in_background(restore_threaded, callback=restore_callback)
-            else:
-                messagebox.showerror("Error", "No backup file found")
-        else:
+        if not youtube:
             messagebox.showwarning("Warning", "Connect account first")
+            return
+        if not latest_backup():
+            messagebox.showerror("Error", "No backup file found")
+            return
+        video_ids = None
+        selected = video_list.selection()
+        if selected:
+            answer = messagebox.askyesnocancel("Restore", f"Restore only the {len(selected)} selected videos? Choose No to restore every video in the backup.")
+            if answer is None:
+                return
+            if answer:
+                video_ids = set(selected)
+        run_bulk(restore_threaded, args=(video_ids,), callback=restore_callback, priority=PRIORITY_HIGH)
 
-    def restore_threaded():
-        with open('backup.json', 'r') as f:
-            backup_data = json.load(f)
-        progress['maximum'] = len(backup_data)
-        count = 0
-        msgs = []
-        batch_size = 5
-        for i in range(0, len(backup_data), batch_size):
-            batch = backup_data[i:i + batch_size]
-            for item in batch:
-                try:
-                    updates = {
-                        'snippet': item['snippet'],
-                        'status': item['status'],
-                        'recordingDetails': item['recordingDetails']
-                    }
-                    update_video(youtube, item['id'], updates)
-                    for v in videos:
-                        if v['id'] == item['id']:
-                            v.update({
-                                'title': item['snippet']['title'],
-                                'description': item['snippet']['description'],
-                                'tags': item['snippet'].get('tags', []),
-                                'categoryId': item['snippet'].get('categoryId'),
-                                'defaultLanguage': item['snippet'].get('defaultLanguage', ''),
-                                'status': item['status'],
-                                'recordingDate': item['recordingDetails'].get('recordingDate', '')
-                            })
-                    msgs.append(f"Restored {item['id']}\n")
-                    count += 1
-                    root.after(0, lambda c=count: progress.config(value=c))
-                    time.sleep(1)
-                except Exception as e:
-                    msgs.append(f"Error restoring {item['id']}: {str(e)}\n")
+    def restore_threaded(video_ids, token):
+        jobs, unchanged, missing = plan_restore(build_service(creds), videos, iter_backup(None, video_ids), token=token)
+        msgs = [f"{len(jobs)} videos differ from the backup, {unchanged} already match\n"]
+        if missing:
+            msgs.append(f"Skipped {len(missing)} videos that no longer exist on the channel\n")
+        root.after(0, lambda n=len(jobs): progress.config(maximum=n, value=0))
+        engine = UpdateEngine(lambda: build_service(creds), limiter=api_limiter)
+        results = engine.run(
+            jobs,
+            lambda yt, job: apply_video_update(yt, job[0], job[1], None, engine.limiter, videos),
+            progress_callback=bulk_progress(), token=token
+        )
+        cancelled = 0
+        for (v, _), _, error in results:
+            if isinstance(error, TaskCancelled):
+                cancelled += 1
+            elif error:
+                msgs.append(f"Error restoring {v['id']}: {str(error)}\n")
+            else:
+                msgs.append(f"Restored {v['id']}\n")
+        if cancelled:
+            msgs.append(f"Cancelled; {cancelled} videos were not restored\n")
         return msgs
 
     def restore_callback(msgs):
@@ -987,254 +3881,220 @@ if __name__ == '__main__':
             log_text.insert(END, msg)
         log_text.see(END)
         progress['value'] = 0
+        video_list.invalidate_sort_keys()
+        filter_videos()
 
     # Show video details
     def show_video_details(event):
         selected = video_tree.selection()
         if selected:
-            item = selected[0]
-            vid_id = video_tree.item(item)['values'][1]
-            for v in videos:
-                if v['id'] == vid_id:
-                    details = json.dumps(v, indent=2)
-                    messagebox.showinfo("Video Details", details)
-                    break
+            v = videos.get(selected[0])
+            if v is not None:
+                details = json.dumps(v.to_dict(), indent=2)
+                messagebox.showinfo("Video Details", details)
 
     video_tree.bind("<Double-1>", show_video_details)
 
-    # Quota estimator
-    def estimate_quota(selected_count, has_thumbnail=False):
-        units = selected_count * 50  # Base update
-        if has_thumbnail:
-            units += selected_count * 100  # Thumbnail
-        return units
-
     # Preview function
+    # Preview: parameters are read here on the UI thread, pages of PREVIEW_PAGE_SIZE videos are diffed in
+    # the background, and each page is rendered with a single insert
+    preview_state = {'edit': None, 'ids': [], 'summary': '', 'page': 0}
+
     def preview():
-        if youtube:
-            run_in_background(preview_threaded, callback=preview_callback)
-        else:
+        if not youtube:
             messagebox.showwarning("Warning", "Connect account first")
+            return
+        run_in_background(preview_threaded, args=(video_list.selection(), read_edit_settings()), callback=preview_callback,
+                          priority=PRIORITY_HIGH)
 
-    def preview_threaded():
-        preview_content = []
-        selected_items = video_tree.selection()
+    def preview_threaded(selected_items, settings):
         if not selected_items:
-            return ["No videos selected\n"]
-        selected_vids = []
-        for item in selected_items:
-            vid_id = video_tree.item(item)['values'][1]
-            for v in videos:
-                if v['id'] == vid_id:
-                    selected_vids.append(v)
-                    break
-        footer = footer_entry.get(1.0, END).strip()
-        find = find_entry.get().strip()
-        replace = replace_entry.get().strip()
-        keyword = trim_keyword_entry.get().strip()
-        action = action_var.get()
-        trim_m = trim_mode.get()
-        use_regex = regex_var.get()
-        title_action = title_action_var.get()
-        title_text = title_entry.get().strip()
-        tags_action = tags_action_var.get()
-        tags_text = tags_entry.get().strip()
-        category = next((k for k, v in CATEGORIES.items() if v == category_var.get()), None)
-        privacy = privacy_var.get() if privacy_var.get() != "no_change" else None
-        license_ = license_var.get() if license_var.get() != "no_change" else None
-        embeddable = True if embeddable_var.get() == "true" else False if embeddable_var.get() == "false" else None
-        public_stats = True if public_stats_var.get() == "true" else False if public_stats_var.get() == "false" else None
-        made_for_kids = True if made_for_kids_var.get() == "true" else False if made_for_kids_var.get() == "false" else None
-        thumbnail_path = thumbnail_path_var.get()
-        language = language_var.get() 
-        recording_date = recording_var.get() if recording_var.get() != "No Change" else None
-        quota_est = estimate_quota(len(selected_vids), bool(thumbnail_path))
-        preview_content.append(f"Estimated Quota Use: {quota_est} units (approximate)\n\n")
-        for v in selected_vids:
-            preview_content.append(f"{v['title']} ({v['id']}):\n")
-            if title_action != "none":
-                new_title, _ = compute_new_title(v['title'], title_action, title_text)
-                preview_content.append(f"New Title: {new_title}\n")
-            if tags_action != "none":
-                new_tags, _ = compute_new_tags(v['tags'], tags_action, tags_text)
-                preview_content.append(f"New Tags: {', '.join(new_tags)}\n")
-            new_desc, desc_changed = compute_new_desc(v['description'], action, footer, find, replace, keyword, trim_m, use_regex)
-            preview_content.append(f"New Description: {new_desc}\n")
-            if not desc_changed and action in ["trim", "find_replace", "replace_after"]:
-                preview_content.append("(No change - keyword not found?)\n")
-            if category:
-                preview_content.append(f"New Category: {CATEGORIES[category]}\n")
-            if privacy:
-                preview_content.append(f"New Privacy: {privacy}\n")
-            if license_:
-                preview_content.append(f"New License: {license_}\n")
-            if embeddable is not None:
-                preview_content.append(f"Embeddable: {embeddable}\n")
-            if public_stats is not None:
-                preview_content.append(f"Public Stats Viewable: {public_stats}\n")
-            if made_for_kids is not None:
-                preview_content.append(f"Made For Kids: {made_for_kids}\n")
-            if thumbnail_path:
-                preview_content.append(f"New Thumbnail: {thumbnail_path}\n")
-            if language:
-                preview_content.append(f"New Default Language: {language}\n")
-            if recording_date:
-                preview_content.append(f"New Recording Date: {recording_date}\n")
-            preview_content.append("\n---\n\n")
-        return preview_content
-
-    def preview_callback(content):
+            return "No videos selected\n"
+        try:
+            edit = CompiledEdit(settings)
+        except ValueError as e:
+            return f"{e}\n"
+        summary = preview_summary(edit, videos.get_many(selected_items), csv_pending)
+        return edit, selected_items, summary, 0, preview_page_text(edit, selected_items, 0)
+
+    def preview_page_text(edit, selected_items, page):
+        page_vids = videos.get_many(selected_items[page * PREVIEW_PAGE_SIZE:(page + 1) * PREVIEW_PAGE_SIZE])
+        return ''.join(iter_preview(edit, page_vids, csv_pending)) or "No changes for the videos on this page\n"
+
+    def preview_callback(result):
+        if isinstance(result, str):
+            preview_state.update(edit=None, ids=[], summary='', page=0)
+            show_preview_page(result)
+            return
+        edit, selected_items, summary, page, text = result
+        preview_state.update(edit=edit, ids=selected_items, summary=summary, page=page)
+        show_preview_page(summary + text)
+
+    def show_preview_page(text):
         preview_text.delete(1.0, END)
-        for line in content:
-            preview_text.insert(END, line)
-        preview_text.see(END)
+        preview_text.insert(END, text)
+        preview_text.see(1.0)
+        pages = max(1, -(-len(preview_state['ids']) // PREVIEW_PAGE_SIZE))
+        preview_page_label.config(text=f"Page {preview_state['page'] + 1} of {pages}" if preview_state['ids'] else "")
+
+    def change_preview_page(step):
+        pages = -(-len(preview_state['ids']) // PREVIEW_PAGE_SIZE)
+        page = preview_state['page'] + step
+        if preview_state['edit'] is None or not 0 <= page < pages:
+            return
+        edit, selected_items, summary = preview_state['edit'], preview_state['ids'], preview_state['summary']
+        run_in_background(lambda: (edit, selected_items, summary, page, preview_page_text(edit, selected_items, page)),
+                          callback=preview_callback, priority=PRIORITY_HIGH)
 
     # Dry run
     def dry_run():
         if youtube:
-            run_in_background(dry_run_threaded, callback=dry_run_callback)
+            run_in_background(dry_run_threaded, args=(video_list.selection(), read_edit_settings()), callback=dry_run_callback)
         else:
             messagebox.showwarning("Warning", "Connect account first")
 
-    def dry_run_threaded():
-        changes = []
-        selected_items = video_tree.selection()
+    def dry_run_threaded(selected_items, settings):
         if not selected_items:
-            return ["No videos selected\n"]
-        selected_vids = []
-        for item in selected_items:
-            vid_id = video_tree.item(item)['values'][1]
-            for v in videos:
-                if v['id'] == vid_id:
-                    selected_vids.append(v)
-                    break
-        # Similar to preview but collect as dict
-        for v in selected_vids:
-            update_dict = {}
-            # Compute changes...
-            # (reuse compute functions, add to update_dict)
-            changes.append({ 'id': v['id'], 'changes': update_dict })
-        with open('dry_run.json', 'w') as f:
-            json.dump(changes, f, indent=2)
-        return "Dry run saved to dry_run.json\n"
+            return "No videos selected\n"
+        try:
+            plan = build_plan(CompiledEdit(settings), videos.get_many(selected_items), csv_pending)
+        except ValueError as e:
+            return f"{e}\n"
+        save_plan(plan, PLAN_FILE)
+        return f"Dry run plan saved to {PLAN_FILE}: " + plan_summary(plan)
 
     def dry_run_callback(msg):
         log_text.insert(END, msg)
+        log_text.see(END)
+
+    def apply_plan():
+        if not youtube:
+            messagebox.showwarning("Warning", "Connect account first")
+            return
+        path = filedialog.askopenfilename(initialfile=PLAN_FILE, filetypes=[("Dry run plans", "*.json")])
+        if not path:
+            return
+        try:
+            plan = load_plan(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if messagebox.askyesno("Confirm", f"Send the requests planned on {plan['createdAt'][:16]}? " + plan_summary(plan)):
+            run_bulk(apply_plan_threaded, args=(plan,), callback=update_callback)
 
     # Update function
     def update_videos():
         if youtube:
             if not messagebox.askyesno("Confirm", "Are you sure you want to update the selected videos?"):
                 return
-            run_in_background(update_videos_threaded, callback=update_callback)
+            run_bulk(update_videos_threaded, args=(video_list.selection(), read_edit_settings()), callback=update_callback)
         else:
             messagebox.showwarning("Warning", "Connect account first")
 
-    def update_videos_threaded():
-        selected_items = video_tree.selection()
+    def resume_update():
+        if not youtube:
+            messagebox.showwarning("Warning", "Connect account first")
+            return
+        run = UpdateJournal.find_run(JOURNAL_FILE)
+        if run is None:
+            messagebox.showinfo("Info", "No interrupted run to resume")
+            return
+        remaining = len(set(run['planned']) - run['done'])
+        if messagebox.askyesno("Confirm", f"Resume run {run['run_id']}? {remaining} of {len(run['planned'])} videos are left."):
+            run_bulk(resume_update_threaded, args=(run,), callback=update_callback)
+
+    def apply_plan_threaded(plan, token):
+        jobs, thumbnails, stale, missing, applied = apply_plan_jobs(plan, videos, UpdateJournal.plan_done(JOURNAL_FILE, plan['source']['sha1']))
+        root.after(0, lambda n=len(jobs): progress.config(maximum=n, value=0))
+        engine = UpdateEngine(lambda: build_service(creds), limiter=api_limiter)
+        journal = UpdateJournal(JOURNAL_FILE)
+        run_id = journal.start_run(plan['settings'], [v['id'] for v, _ in jobs], jobs, thumbnails, plan['source'])
+        try:
+            results = run_journaled_updates(
+                engine, journal, run_id, jobs, thumbnails, videos,
+                progress_callback=bulk_progress(), token=token
+            )
+        finally:
+            journal.close()
+        msgs = []
+        if applied:
+            msgs.append(f"Skipped {len(applied)} videos an earlier run of this plan already updated\n")
+        if stale:
+            msgs.append(f"Skipped {len(stale)} videos changed since the plan was made; run Dry Run again for them\n")
+        if missing:
+            msgs.append(f"Skipped {len(missing)} videos no longer on the channel\n")
+        msgs.extend(update_result_messages(results))
+        with open('update_log.txt', 'a') as f:
+            f.write(''.join(msgs))
+        return msgs
+
+    def update_result_messages(results):
+        msgs = []
+        cancelled = 0
+        for (v, _), _, error in results:
+            if isinstance(error, TaskCancelled):
+                cancelled += 1
+            elif error:
+                msgs.append(f"Error updating {v['id']}: {str(error)}\n")
+            else:
+                msgs.append(f"Updated {v['id']} successfully\n")
+        if cancelled:
+            msgs.append(f"Cancelled; {cancelled} videos were not sent. Use Resume Run to finish them.\n")
+        if any(is_quota_error(error) for _, _, error in results):
+            msgs.append("Daily quota exceeded; the remaining videos were not sent. Use Resume Run after the quota resets.\n")
+        msgs.append(api_metrics.summary() + "\n")
+        return msgs
+
+    def resume_update_threaded(run, token):
+        jobs, thumbnails = journaled_jobs(run, videos)
+        root.after(0, lambda n=len(jobs): progress.config(maximum=n, value=0))
+        engine = UpdateEngine(lambda: build_service(creds), limiter=api_limiter)
+        journal = UpdateJournal(JOURNAL_FILE)
+        try:
+            results = run_journaled_updates(
+                engine, journal, run['run_id'], jobs, thumbnails, videos,
+                progress_callback=bulk_progress(), token=token
+            )
+        finally:
+            journal.close()
+        msgs = [f"Resumed run {run['run_id']}: {len(run['done'])} videos were already done\n"]
+        msgs.extend(update_result_messages(results))
+        with open('update_log.txt', 'a') as f:
+            f.write(''.join(msgs))
+        return msgs
+
+    def update_videos_threaded(selected_items, settings, token):
         if not selected_items:
             return ["No videos selected\n"]
-        selected_vids = []
-        for item in selected_items:
-            vid_id = video_tree.item(item)['values'][1]
-            for v in videos:
-                if v['id'] == vid_id:
-                    selected_vids.append(v)
-                    break
-        footer = footer_entry.get(1.0, END).strip()
-        find = find_entry.get().strip()
-        replace = replace_entry.get().strip()
-        keyword = trim_keyword_entry.get().strip()
-        action = action_var.get()
-        trim_m = trim_mode.get()
-        use_regex = regex_var.get()
-        title_action = title_action_var.get()
-        title_text = title_entry.get().strip()
-        tags_action = tags_action_var.get()
-        tags_text = tags_entry.get().strip()
-        category = next((k for k, v in CATEGORIES.items() if v == category_var.get()), None)
-        privacy = privacy_var.get() if privacy_var.get() != "no_change" else None
-        license_ = license_var.get() if license_var.get() != "no_change" else None
-        embeddable = True if embeddable_var.get() == "true" else False if embeddable_var.get() == "false" else None
-        public_stats = True if public_stats_var.get() == "true" else False if public_stats_var.get() == "false" else None
-        made_for_kids = True if made_for_kids_var.get() == "true" else False if made_for_kids_var.get() == "false" else None
-        thumbnail_path = thumbnail_path_var.get()
-        language = language_var.get() 
-        recording_date = recording_var.get() if recording_var.get() != "No Change" else None
-        # Validation
-        if action in ["find_replace", "trim", "replace_after"] and use_regex:
-            try:
-                re.compile(find if action == "find_replace" else keyword)
-            except re.error:
-                return ["Invalid regex pattern\n"]
-        if recording_date != "No Change":
-            try:
-                datetime.fromisoformat(recording_date.replace('Z', '+00:00'))
-            except ValueError:
-                return ["Invalid recording date format (use ISO 8601)\n"]
+        selected_vids = videos.get_many(selected_items)
+        try:
+            edit = CompiledEdit(settings)
+        except ValueError as e:
+            return [f"{e}\n"]
+        jobs = edit.build_jobs(selected_vids, csv_pending)
+        skipped = len(selected_vids) - len(jobs)
+        saved = skipped_update_units(selected_vids, jobs)
+        thumbnails = edit.thumbnail_map(jobs)
 
-        progress['maximum'] = len(selected_vids)
-        count = 0
+        root.after(0, lambda n=len(jobs): progress.config(maximum=n, value=0))
+        engine = UpdateEngine(lambda: build_service(creds), limiter=api_limiter)
+        journal = UpdateJournal(JOURNAL_FILE)
+        run_id = journal.start_run(settings, list(selected_items), jobs, thumbnails)
+        try:
+            results = run_journaled_updates(
+                engine, journal, run_id, jobs, thumbnails, videos,
+                progress_callback=bulk_progress(), token=token
+            )
+        finally:
+            journal.close()
+        failed = {v['id'] for (v, _), _, error in results if error}
+        for v in selected_vids:
+            if v['id'] not in failed:
+                csv_pending.pop(v['id'], None)  # Sent, or already matching the server
         msgs = []
-        batch_size = 5
-        for i in range(0, len(selected_vids), batch_size):
-            batch = selected_vids[i:i + batch_size]
-            for v in batch:
-                try:
-                    updates = {}
-                    snippet_updates = {}
-                    status_updates = {}
-                    recording_updates = {}
-                    if title_action != "none":
-                        new_title, _ = compute_new_title(v['title'], title_action, title_text)
-                        snippet_updates['title'] = new_title
-                    if tags_action != "none":
-                        new_tags, _ = compute_new_tags(v['tags'], tags_action, tags_text)
-                        snippet_updates['tags'] = new_tags
-                    new_desc, _ = compute_new_desc(v['description'], action, footer, find, replace, keyword, trim_m, use_regex)
-                    snippet_updates['description'] = new_desc
-                    if category:
-                        snippet_updates['categoryId'] = category
-                    if language:
-                        snippet_updates['defaultLanguage'] = language
-                    if snippet_updates:
-                        updates['snippet'] = snippet_updates
-                    if privacy:
-                        status_updates['privacyStatus'] = privacy
-                    if license_:
-                        status_updates['license'] = license_
-                    if embeddable is not None:
-                        status_updates['embeddable'] = embeddable
-                    if public_stats is not None:
-                        status_updates['publicStatsViewable'] = public_stats
-                    if made_for_kids is not None:
-                        status_updates['selfDeclaredMadeForKids'] = made_for_kids
-                    if status_updates:
-                        updates['status'] = status_updates
-                    if recording_date:
-                        recording_updates['recordingDate'] = recording_date
-                        updates['recordingDetails'] = recording_updates
-                    if updates:
-                        update_video(youtube, v['id'], updates)
-                    if thumbnail_path:
-                        set_thumbnail(youtube, v['id'], thumbnail_path)
-                    # Update local
-                    if 'snippet' in updates:
-                        v['title'] = updates['snippet'].get('title', v['title'])
-                        v['description'] = updates['snippet'].get('description', v['description'])
-                        v['tags'] = updates['snippet'].get('tags', v['tags'])
-                        v['categoryId'] = updates['snippet'].get('categoryId', v['categoryId'])
-                        v['defaultLanguage'] = updates['snippet'].get('defaultLanguage', v['defaultLanguage'])
-                    if 'status' in updates:
-                        v['status'].update(updates['status'])
-                    if 'recordingDetails' in updates:
-                        v['recordingDate'] = updates['recordingDetails'].get('recordingDate', v['recordingDate'])
-                    msgs.append(f"Updated {v['id']} successfully\n")
-                    count += 1
-                    root.after(0, lambda c=count: progress.config(value=c))
-                    time.sleep(2)  # Increased delay for rate limits
-                except Exception as e:
-                    msgs.append(f"Error updating {v['id']}: {str(e)}\n")
+        if saved:
+            msgs.append(f"Skipped {skipped} unchanged videos (saved {saved} quota units)\n")
+        msgs.extend(update_result_messages(results))
         # Auto-save log
         with open('update_log.txt', 'a') as f:
             f.write(''.join(msgs))
@@ -1245,13 +4105,78 @@ if __name__ == '__main__':
             log_text.insert(END, msg)
         log_text.see(END)
         progress['value'] = 0
+        video_list.invalidate_sort_keys()
         filter_videos()
 
+    # Quota-aware scheduling; runs on its own thread rather than the bulk lane because it can wait days for a
+    # quota reset. At most one scheduler runs; a job queued meanwhile is picked up by the running one.
+    scheduler_state = {'running': False, 'lock': threading.Lock()}
+
+    def schedule_update():
+        if not youtube:
+            messagebox.showwarning("Warning", "Connect account first")
+            return
+        selected_items = video_list.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", "No videos selected")
+            return
+        priority = priority_var.get()
+        if not messagebox.askyesno("Confirm", f"Queue {len(selected_items)} videos ({priority} first) and run them as quota allows?"):
+            return
+        token = new_bulk_token()
+        threading.Thread(target=schedule_threaded, args=(selected_items, read_edit_settings(), priority, token), daemon=True).start()
+
+    def schedule_log(msg):
+        root.after(0, lambda: (log_text.insert(END, msg + "\n"), log_text.see(END)))
+
+    def schedule_threaded(selected_items, settings, priority, token):
+        owner = False
+        try:
+            edit = CompiledEdit(settings)  # Reads and checks the thumbnail, so kept off the Tk thread
+            jobs = edit.build_jobs(videos.get_many(selected_items), csv_pending)
+            view_counts = fetch_view_counts(build_service(creds), [v['id'] for v, _ in jobs]) if priority == 'most_viewed' else None
+            job_queue = JobQueue(video_db)
+            job_id = job_queue.enqueue("GUI edit", jobs, priority, edit.thumbnail_path, view_counts)
+            schedule_log(f"Queued job {job_id}: {len(jobs)} videos")
+            with scheduler_state['lock']:
+                if scheduler_state['running']:
+                    return  # The running scheduler picks the new job up after its current one
+                scheduler_state['running'] = owner = True
+            engine = UpdateEngine(lambda: build_service(creds), limiter=api_limiter)
+            scheduler = QuotaScheduler(job_queue, engine, videos, log=schedule_log, token=token)
+            while True:
+                scheduler.run()
+                with scheduler_state['lock']:
+                    # A job queued while the last one was finishing saw a running scheduler and left it to this one
+                    if not job_queue.pending_count():
+                        scheduler_state['running'] = owner = False
+                        break
+            schedule_log("Scheduled jobs finished")
+            root.after(0, filter_videos)
+        except ValueError as e:
+            schedule_log(str(e))
+        except TaskCancelled:
+            schedule_log("Scheduler cancelled; unfinished videos stay queued")
+        except Exception as e:
+            schedule_log(f"Scheduler error: {str(e)}")
+        finally:
+            if owner:
+                with scheduler_state['lock']:
+                    scheduler_state['running'] = False
+            root.after(0, bulk_tokens.discard, token)  # bulk_tokens belongs to the Tk thread
+
     backup_button['command'] = backup
     restore_button['command'] = restore
     preview_button['command'] = preview
+    preview_prev_button['command'] = lambda: change_preview_page(-1)
+    preview_next_button['command'] = lambda: change_preview_page(1)
     dry_run_button['command'] = dry_run
+    apply_plan_button['command'] = apply_plan
     update_button['command'] = update_videos
+    resume_button['command'] = resume_update
+    pause_button['command'] = toggle_pause
+    cancel_button['command'] = cancel_bulk
+    schedule_button['command'] = schedule_update
 
     # Initial connect
     connect_account()